@@ -12,6 +12,15 @@ def create_app():
     app = Flask(__name__)
     app.config.from_object(config)
 
+    # 커넥션 풀 프로필 → 엔진 옵션 (SQLALCHEMY_ENGINE_OPTIONS 를 직접 지정했으면 그대로)
+    if "SQLALCHEMY_ENGINE_OPTIONS" not in app.config:
+        from .db_pool import engine_options, resolve_profile
+        profile = resolve_profile(app.config)
+        if profile is not None:
+            app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(
+                app.config["SQLALCHEMY_DATABASE_URI"], profile
+            )
+
     # ORM initialization
     db.init_app(app)
     migrate.init_app(app, db)
@@ -26,6 +35,7 @@ def create_app():
         answer_views,
         auth_views,      # ✅ 기존에 있던 auth 그대로 유지
         predict_views,   # ✅ 우리가 새로 만든 고독사 예측 뷰
+        internal_views,  # 운영용 (풀 상태 등)
     )
 
     app.register_blueprint(main_views.bp)
@@ -33,6 +43,18 @@ def create_app():
     app.register_blueprint(answer_views.bp)
     app.register_blueprint(auth_views.bp)      # ✅ 계정/로그인 관련
     app.register_blueprint(predict_views.bp)   # ✅ /predict URL 담당
+    app.register_blueprint(internal_views.bp)  # /internal (로컬 접근만)
+
+    # 요청 단위 계측 (opt-in)
+    if app.config.get("INSTRUMENTATION_ENABLED"):
+        from . import instrumentation
+        instrumentation.init_app(app)
+
+    # ML 데이터/모델은 기본적으로 첫 요청 때 로드, 필요하면 미리 로드
+    # (preforking 서버에서는 fork 전에 고정해서 워커들이 페이지를 공유)
+    if app.config.get("ML_EAGER_LOAD"):
+        from .ml.preload import preload
+        preload()
 
     import os
     print(">>> TEMPLATE SEARCH PATH:", app.jinja_loader.searchpath)
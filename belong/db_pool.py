@@ -0,0 +1,203 @@
+"""
+belong.db_pool
+
+- 환경별 커넥션 풀 프로필 → SQLALCHEMY_ENGINE_OPTIONS 변환
+    - 프로필 키: pool_size, max_overflow, pool_timeout, pool_recycle, pool_pre_ping, pool_use_lifo,
+      statement_cache_size, arraysize
+    - DB 종류에 맞는 옵션만 남긴다
+      (Oracle: cx_Oracle stmtcachesize / arraysize, SQLite: cached_statements,
+       메모리 SQLite 처럼 QueuePool 을 쓰지 않는 경우 풀 크기 옵션 제외)
+- 풀 계측 (InstrumentedQueuePool)
+    - checkout 대기 시간(최근 N 개 백분위수), 사용 중 / 최대 사용 중 커넥션 수
+    - 새 커넥션 생성 / 무효화 / checkout 타임아웃 횟수
+    - /internal/db-pool 에서 JSON 으로 확인 (belong.views.internal_views)
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+# 최근 checkout 대기 시간 보관 개수 (백분위수 계산용)
+LATENCY_WINDOW = 2048
+
+_POOL_KEYS = ("pool_size", "max_overflow", "pool_timeout", "pool_use_lifo")
+
+
+class PoolMetrics:
+    """프로세스 안의 풀 하나에 대한 누적 통계 (스레드 안전)."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._lock = threading.Lock()
+        self._latencies: "deque[float]" = deque(maxlen=window)
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._latencies.clear()
+            self.checkouts = 0
+            self.timeouts = 0
+            self.connects = 0
+            self.invalidations = 0
+            self.in_use = 0
+            self.peak_in_use = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+
+    # ---- 이벤트에서 호출 ----
+    def record_checkout(self, wait: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self._latencies.append(wait)
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def record_checkin(self) -> None:
+        with self._lock:
+            self.in_use = max(self.in_use - 1, 0)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def record_invalidate(self) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            result = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "wait_ms_mean": self.total_wait / self.checkouts * 1000 if self.checkouts else 0.0,
+                "wait_ms_max": self.max_wait * 1000,
+            }
+        for name, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+            result[f"wait_ms_{name}"] = (
+                latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1000 if latencies else 0.0
+            )
+        return result
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    checkout(connect) 대기 시간을 재는 QueuePool.
+    대기 / 새 커넥션 생성 / pre-ping 을 모두 포함한 "요청이 커넥션을 받기까지" 시간이다.
+    dispose() 후 recreate() 해도 같은 클래스로 다시 만들어진다.
+    """
+
+    metrics = pool_metrics
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            conn = super().connect()
+        except PoolTimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(time.perf_counter() - started)
+        return conn
+
+
+@event.listens_for(InstrumentedQueuePool, "checkin")
+def _on_checkin(dbapi_connection, connection_record):
+    InstrumentedQueuePool.metrics.record_checkin()
+
+
+@event.listens_for(InstrumentedQueuePool, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    InstrumentedQueuePool.metrics.record_connect()
+
+
+@event.listens_for(InstrumentedQueuePool, "invalidate")
+def _on_invalidate(dbapi_connection, connection_record, exception):
+    InstrumentedQueuePool.metrics.record_invalidate()
+
+
+def engine_options(uri: str, profile: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    풀 프로필 → create_engine 옵션 (SQLALCHEMY_ENGINE_OPTIONS).
+
+        engine_options("oracle+cx_oracle://...", {"pool_size": 10, "arraysize": 500})
+        → {"poolclass": InstrumentedQueuePool, "pool_size": 10, "arraysize": 500, ...}
+    """
+    url = make_url(uri)
+    backend = url.get_backend_name()
+    options: Dict[str, Any] = {}
+    connect_args: Dict[str, Any] = {}
+
+    # 메모리 SQLite 는 SingletonThreadPool (연결 하나) → 풀 크기 / 계측 없음
+    memory_sqlite = backend == "sqlite" and url.database in (None, "", ":memory:")
+    if not memory_sqlite:
+        options["poolclass"] = InstrumentedQueuePool
+        for key in _POOL_KEYS:
+            if profile.get(key) is not None:
+                options[key] = profile[key]
+
+    if profile.get("pool_recycle") is not None:
+        options["pool_recycle"] = profile["pool_recycle"]
+    if profile.get("pool_pre_ping") is not None:
+        options["pool_pre_ping"] = profile["pool_pre_ping"]
+
+    cache_size = profile.get("statement_cache_size")
+    if backend == "oracle":
+        if profile.get("arraysize") is not None:
+            options["arraysize"] = profile["arraysize"]
+        if cache_size is not None:
+            connect_args["stmtcachesize"] = cache_size
+    elif backend == "sqlite":
+        if cache_size is not None:
+            connect_args["cached_statements"] = cache_size
+
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+
+def pool_status(engine) -> Dict[str, Any]:
+    """현재 풀 상태 + 누적 계측값 (JSON 직렬화 가능한 dict)"""
+    pool = engine.pool
+    status: Dict[str, Any] = {"pool": type(pool).__name__, "dialect": engine.dialect.name}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            timeout=pool.timeout(),
+        )
+    if isinstance(pool, InstrumentedQueuePool):
+        status["metrics"] = pool.metrics.snapshot()
+    return status
+
+
+def resolve_profile(config) -> Optional[Dict[str, Any]]:
+    """config 의 DB_POOL_PROFILE 이름으로 DB_POOL_PROFILES 에서 프로필을 찾는다 (없으면 KeyError)."""
+    name = config.get("DB_POOL_PROFILE")
+    if not name:
+        return None
+    profiles = config.get("DB_POOL_PROFILES") or {}
+    if name not in profiles:
+        raise KeyError(f"알 수 없는 DB_POOL_PROFILE 입니다: {name} (가능: {sorted(profiles)})")
+    return profiles[name]
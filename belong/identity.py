@@ -0,0 +1,136 @@
+"""
+belong.identity
+
+- g.user 를 지연 로딩 프록시(LazyUser)로 제공
+    - 요청 시작 시에는 session 의 user_id 만 보관하고,
+      실제로 g.user 를 읽을 때(템플릿 navbar 등) 처음 한 번만 조회
+    - static / JSON API 처럼 g.user 를 안 쓰는 요청은 Users 조회 없음
+- 조회 결과는 프로세스 로컬 LRU/TTL 캐시(belong.cache)에 값 복사본으로 보관
+    - 로그아웃 / ORM 으로 Users 수정·삭제 시 해당 id 무효화
+    - 다른 워커에서 수정된 사용자는 USER_CACHE_TTL 안에 반영
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, NamedTuple, Optional
+
+from flask import current_app
+from sqlalchemy import event
+
+from . import db
+from .cache import LRUCache
+from .models import Users
+
+
+class CachedUser(NamedTuple):
+    """
+    캐시에 보관하는 Users 행의 값 복사본 (비밀번호 해시는 보관하지 않음).
+    """
+    id: int
+    username: str
+    email: str
+
+    @classmethod
+    def from_row(cls, row: Users) -> "CachedUser":
+        return cls(row.id, row.username, row.email)
+
+
+_cache: Optional[LRUCache] = None
+_cache_lock = threading.Lock()
+
+
+def user_cache() -> LRUCache:
+    """
+    user_id → CachedUser 캐시.
+    크기 / TTL 은 config 의 USER_CACHE_SIZE / USER_CACHE_TTL.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LRUCache(
+                    maxsize=current_app.config.get("USER_CACHE_SIZE", 1024),
+                    ttl=current_app.config.get("USER_CACHE_TTL"),
+                )
+    return _cache
+
+
+def invalidate_user(user_id: Optional[int] = None) -> None:
+    """user_id 하나 또는 (인자가 없으면) 캐시 전체를 비운다."""
+    if _cache is None:
+        return
+    if user_id is None:
+        _cache.clear()
+    else:
+        _cache.invalidate(user_id)
+
+
+@event.listens_for(Users, "after_update")
+@event.listens_for(Users, "after_delete")
+def _invalidate_row(mapper, connection, target):
+    # 프로필 변경 / 탈퇴 시 해당 id 만 무효화
+    invalidate_user(target.id)
+
+
+def get_user(user_id: int) -> Optional[CachedUser]:
+    """캐시 → DB 순으로 조회. 없는 사용자면 None (없는 결과는 캐시하지 않는다)"""
+    cache = user_cache()
+    cached = cache.get(user_id)
+    if cached is not None:
+        return cached
+
+    row = db.session.get(Users, user_id)
+    if row is None:
+        return None
+    cached = CachedUser.from_row(row)
+    cache.set(user_id, cached)
+    return cached
+
+
+_UNSET = object()
+
+
+class LazyUser:
+    """
+    g.user 지연 로딩 프록시.
+    참/거짓 판정이나 속성 접근(g.user.username)이 처음 일어날 때 get_user 를 한 번 호출한다.
+    없는 사용자(탈퇴 등)면 거짓으로 평가된다.
+    """
+
+    __slots__ = ("user_id", "_user")
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self._user: Any = _UNSET
+
+    def _resolve(self) -> Optional[CachedUser]:
+        if self._user is _UNSET:
+            self._user = get_user(self.user_id)
+        return self._user
+
+    @property
+    def loaded(self) -> bool:
+        return self._user is not _UNSET
+
+    def __bool__(self) -> bool:
+        return self._resolve() is not None
+
+    def __getattr__(self, name: str) -> Any:
+        user = self._resolve()
+        if user is None:
+            raise AttributeError(name)
+        return getattr(user, name)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyUser):
+            other = other._resolve()
+        return self._resolve() == other
+
+    def __hash__(self) -> int:
+        return hash(self.user_id)
+
+    def __repr__(self) -> str:
+        if self._user is _UNSET:
+            return f"<LazyUser id={self.user_id} (not loaded)>"
+        return f"<LazyUser {self._user!r}>"
@@ -0,0 +1,303 @@
+"""
+belong.instrumentation
+
+- 요청 단위 계측 (INSTRUMENTATION_ENABLED = True 일 때만 create_app 에서 init_app)
+    - endpoint 별 전체 시간, SQL 쿼리 수 / 시간 (SQLAlchemy before/after_cursor_execute)
+    - ML 예측 / 추론 시간 (belong.ml.loader.timing_observers)
+    - 템플릿 렌더링 시간 (Flask before_render_template / template_rendered 시그널)
+    - 이름별 Histogram (최근 N 개 p50 / p90 / p99 + 누적 count / sum / max)
+- /internal/metrics 에서 JSON 으로 확인 (belong.views.internal_views)
+- SLOW_REQUEST_PROFILE_DIR 을 지정하면 샘플링 프로파일러를 켠다
+    - 요청 처리 중인 스레드의 스택을 PROFILE_SAMPLE_INTERVAL_MS 마다 수집
+    - SLOW_REQUEST_MS 보다 오래 걸린 요청만 collapsed stack 파일(.folded)로 저장
+      (flamegraph.pl / speedscope 로 바로 볼 수 있는 "함수;함수;... 샘플수" 형식)
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Dict, List, Optional
+
+from flask import Flask, before_render_template, g, has_request_context, request, template_rendered
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# 이름별로 보관할 최근 측정값 개수 (백분위수 계산용)
+HISTOGRAM_WINDOW = 1024
+
+
+class Histogram:
+    """
+    최근 window 개 값의 백분위수 + 전체 누적 count / sum / max (스레드 안전).
+    시간은 초로 넣고 ms 로 보고 (unit="ms"), 개수 등은 unit="" 로 그대로 보고.
+    """
+
+    def __init__(self, window: int = HISTOGRAM_WINDOW, unit: str = "ms"):
+        self.unit = unit
+        self._scale = 1000.0 if unit == "ms" else 1.0
+        self._lock = threading.Lock()
+        self._values: "deque[float]" = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._values.append(value)
+            self.count += 1
+            self.total += value
+            if value > self.max:
+                self.max = value
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            values = sorted(self._values)
+            count, total, peak = self.count, self.total, self.max
+        scale, suffix = self._scale, f"_{self.unit}" if self.unit else ""
+        result = {
+            "count": count,
+            f"mean{suffix}": total / count * scale if count else 0.0,
+            f"max{suffix}": peak * scale,
+        }
+        for name, q in (("p50", 0.50), ("p90", 0.90), ("p99", 0.99)):
+            result[f"{name}{suffix}"] = (
+                values[min(int(q * len(values)), len(values) - 1)] * scale if values else 0.0
+            )
+        return result
+
+
+class Registry:
+    """이름 → Histogram"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Histogram] = {}
+
+    def histogram(self, name: str, unit: str = "ms") -> Histogram:
+        hist = self._histograms.get(name)
+        if hist is None:
+            with self._lock:
+                hist = self._histograms.setdefault(name, Histogram(unit=unit))
+        return hist
+
+    def observe(self, name: str, value: float, unit: str = "ms") -> None:
+        self.histogram(name, unit).observe(value)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            items = sorted(self._histograms.items())
+        return {name: hist.snapshot() for name, hist in items}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+
+metrics = Registry()
+
+
+class RequestStats:
+    """요청 하나의 누적값 (g._instrument)"""
+
+    __slots__ = ("started", "sql_count", "sql_time", "ml_time", "template_time", "template_starts")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.ml_time = 0.0
+        self.template_time = 0.0
+        self.template_starts: List[float] = []
+
+
+def _current_stats() -> Optional[RequestStats]:
+    if not has_request_context():
+        return None
+    return g.get("_instrument")
+
+
+# ==========================================
+# SQL / ML / 템플릿 훅
+# ==========================================
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("_instrument_starts", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("_instrument_starts")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    metrics.observe("sql", elapsed)
+    stats = _current_stats()
+    if stats is not None:
+        stats.sql_count += 1
+        stats.sql_time += elapsed
+
+
+def _observe_ml(name: str, elapsed: float) -> None:
+    metrics.observe(name, elapsed)
+    stats = _current_stats()
+    # 바깥 호출(predict_for / predict_many)만 요청 시간에 더한다 (추론은 그 안에서 일어남)
+    if stats is not None and name != "ml.inference":
+        stats.ml_time += elapsed
+
+
+def _before_render(sender, template, context, **extra):
+    stats = _current_stats()
+    if stats is not None:
+        stats.template_starts.append(time.perf_counter())
+
+
+def _rendered(sender, template, context, **extra):
+    stats = _current_stats()
+    if stats is None or not stats.template_starts:
+        return
+    elapsed = time.perf_counter() - stats.template_starts.pop()
+    metrics.observe(f"template:{template.name}", elapsed)
+    if not stats.template_starts:   # 중첩 render_template 은 바깥 것만 합산
+        stats.template_time += elapsed
+
+
+# ==========================================
+# 샘플링 프로파일러 (느린 요청 덤프용)
+# ==========================================
+
+class SamplingProfiler:
+    """
+    등록된 스레드(처리 중인 요청)의 스택을 interval 초마다 수집하는 백그라운드 스레드.
+    요청이 없을 때는 대기만 한다.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._active: Dict[int, Counter] = {}
+        self._wakeup = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def start(self, thread_id: int) -> None:
+        with self._lock:
+            self._active[thread_id] = Counter()
+        self._wakeup.set()
+
+    def stop(self, thread_id: int) -> Counter:
+        with self._lock:
+            samples = self._active.pop(thread_id, Counter())
+            if not self._active:
+                self._wakeup.clear()
+        return samples
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while True:
+            self._wakeup.wait()
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id, samples in self._active.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None and thread_id != own:
+                        samples[_collapse(frame)] += 1
+            time.sleep(self.interval)
+
+
+def _collapse(frame) -> str:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+_dump_seq = itertools.count(1)
+
+
+def dump_profile(directory: str, endpoint: str, elapsed: float, samples: Counter) -> Optional[str]:
+    """collapsed stack 형식으로 저장하고 경로를 반환 (샘플이 없으면 None)"""
+    if not samples:
+        return None
+    os.makedirs(directory, exist_ok=True)
+    safe = re.sub(r"[^A-Za-z0-9_.-]", "_", endpoint)
+    path = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{next(_dump_seq)}-{safe}-{int(elapsed * 1000)}ms.folded")
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, count in samples.most_common():
+            f.write(f"{stack} {count}\n")
+    return path
+
+
+# ==========================================
+# Flask 연결
+# ==========================================
+
+_hooks_installed = False
+_hooks_lock = threading.Lock()
+
+
+def _install_global_hooks() -> None:
+    """SQLAlchemy / loader 훅은 프로세스에 한 번만 (앱을 여러 번 만들어도 중복 집계 없음)"""
+    global _hooks_installed
+    with _hooks_lock:
+        if _hooks_installed:
+            return
+        from .ml import loader
+
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        loader.timing_observers.append(_observe_ml)
+        _hooks_installed = True
+
+
+def init_app(app: Flask) -> None:
+    _install_global_hooks()
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_rendered, app)
+
+    profile_dir = app.config.get("SLOW_REQUEST_PROFILE_DIR")
+    profiler = None
+    if profile_dir:
+        profiler = SamplingProfiler(app.config.get("PROFILE_SAMPLE_INTERVAL_MS", 5) / 1000)
+    app.extensions["instrumentation"] = metrics
+
+    def _start_request():
+        g._instrument = RequestStats()
+        if profiler is not None:
+            profiler.start(threading.get_ident())
+
+    # 다른 before_request (auth 블루프린트의 사용자 조회 등) 보다 먼저 실행해야
+    # 그 SQL 도 요청별 집계에 들어간다 → 블루프린트 등록 뒤에 불려도 맨 앞에 끼운다
+    app.before_request_funcs.setdefault(None, []).insert(0, _start_request)
+
+    @app.teardown_request
+    def _finish_request(exc):
+        stats = g.pop("_instrument", None)
+        if stats is None:
+            return
+        elapsed = time.perf_counter() - stats.started
+        endpoint = request.endpoint or "<unmatched>"
+
+        metrics.observe(f"request:{endpoint}", elapsed)
+        metrics.observe(f"request_sql:{endpoint}", stats.sql_time)
+        metrics.observe(f"request_sql_count:{endpoint}", stats.sql_count, unit="")
+        if stats.ml_time:
+            metrics.observe(f"request_ml:{endpoint}", stats.ml_time)
+        if stats.template_time:
+            metrics.observe(f"request_template:{endpoint}", stats.template_time)
+
+        if profiler is not None:
+            samples = profiler.stop(threading.get_ident())
+            if elapsed * 1000 >= app.config.get("SLOW_REQUEST_MS", 500):
+                path = dump_profile(profile_dir, endpoint, elapsed, samples)
+                if path:
+                    app.logger.warning(
+                        "느린 요청 %s %.0f ms (SQL %d개 %.0f ms) → %s",
+                        endpoint, elapsed * 1000, stats.sql_count, stats.sql_time * 1000, path,
+                    )
@@ -20,6 +20,15 @@ DATA_PATH = PROJECT_ROOT / "Dataset_ML.csv"
 # 학습된 모델(pipeline)을 저장할 위치 (pybo/ml/lonely_death_model.pkl)
 MODEL_PATH = PACKAGE_ROOT / "lonely_death_model.pkl"
 
+# MODEL_PATH 를 순수 NumPy 예측기로 컴파일한 사본 (fast_predict 모듈, 있으면 loader 가 우선 사용)
+FAST_MODEL_PATH = PACKAGE_ROOT / "lonely_death_model.npz"
+
+# 버전별 모델 산출물 보관 위치 (registry 모듈, CURRENT 가 있으면 MODEL_PATH 대신 사용)
+MODEL_REGISTRY_DIR = PACKAGE_ROOT / "models"
+
+# 하이퍼파라미터 탐색(train_lonely_death --search) 결과 리포트 (지표 / 소요 시간)
+MODEL_REPORT_PATH = PACKAGE_ROOT / "lonely_death_model_report.json"
+
 # 타깃 컬럼: 고독사 발생 인원수
 TARGET_COL = "값"
 
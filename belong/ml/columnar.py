@@ -0,0 +1,175 @@
+"""
+pybo.ml.columnar
+
+- CSV(Dataset_ML.csv, 미래 예측 CSV)를 컬럼별 .npy 파일 묶음으로 변환하는 빌드 단계
+- 문자열 컬럼(구 등)은 사전 인코딩: 정수 코드 .npy + meta.json 의 categories
+- 정수 컬럼은 int32 로 맞출 수 있으면 int32 로 저장 (읽는 쪽에서 변환 복사 없이 view 로 사용)
+- 로드 시 np.load(mmap_mode="r") 로 읽기 전용 매핑 → CSV 파싱 비용이 사라진다.
+    - 미래 예측 저장소(FutureStore)의 연도 / 예측값 배열은 끝까지 mmap view 라서
+      여러 gunicorn 워커가 같은 페이지를 공유한다.
+    - Dataset_ML 은 피처 계산(정렬 / lag / float64 행렬)에서 새 배열을 만들므로
+      워커마다 사본이 생긴다. 공유하려면 fork 전에 미리 로드 (belong.ml.preload).
+- 원본 CSV 가 바이너리보다 새로우면(크기/mtime 불일치) CSV 로 fallback
+
+사용법:
+    python -m belong.ml.columnar      # DATA_PATH, FUTURE_PRED_PATH 둘 다 변환
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from . import DATA_PATH, FUTURE_PRED_PATH
+
+PathLike = Union[str, Path]
+
+CACHE_SUFFIX = ".npcache"
+META_FILE = "meta.json"
+FORMAT_VERSION = 2   # 2: 정수 컬럼 int32 저장
+
+
+def cache_dir_for(csv_path: PathLike) -> Path:
+    """예: Dataset_ML.csv → Dataset_ML.npcache/"""
+    return Path(csv_path).with_suffix(CACHE_SUFFIX)
+
+
+def _source_stamp(csv_path: Path) -> Optional[dict]:
+    try:
+        st = os.stat(csv_path)
+    except FileNotFoundError:
+        return None
+    return {"source_size": st.st_size, "source_mtime_ns": st.st_mtime_ns}
+
+
+def _read_meta(cache_dir: Path) -> Optional[dict]:
+    try:
+        with open(cache_dir / META_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def is_fresh(csv_path: PathLike) -> bool:
+    """
+    바이너리 사본이 있고 원본 CSV 와 크기/mtime 이 같으면 True.
+    CSV 가 없고 바이너리만 배포된 경우도 True.
+    """
+    csv_path = Path(csv_path)
+    meta = _read_meta(cache_dir_for(csv_path))
+    if meta is None or meta.get("format_version") != FORMAT_VERSION:
+        return False
+
+    stamp = _source_stamp(csv_path)
+    if stamp is None:
+        return True
+    return (
+        meta["source_size"] == stamp["source_size"]
+        and meta["source_mtime_ns"] == stamp["source_mtime_ns"]
+    )
+
+
+def build_cache(csv_path: PathLike, sort_by: Optional[Sequence[str]] = None) -> Path:
+    """
+    CSV 를 읽어 컬럼별 .npy + meta.json 으로 저장하고 디렉터리 경로를 반환.
+    sort_by 를 주면 그 순서로 정렬해서 저장한다 (읽는 쪽에서 재정렬 생략 가능).
+    임시 디렉터리에 쓴 뒤 이름을 바꿔서, 읽는 쪽이 반쯤 쓰인 파일을 보지 않게 한다.
+    """
+    csv_path = Path(csv_path)
+    stamp = _source_stamp(csv_path)
+    df = pd.read_csv(csv_path)
+    if sort_by:
+        df = df.sort_values(list(sort_by), kind="mergesort").reset_index(drop=True)
+
+    target = cache_dir_for(csv_path)
+    # 임시 / 이전 디렉터리도 *.npcache 이름으로 (.gitignore 대상)
+    tmp_dir = Path(tempfile.mkdtemp(
+        prefix=target.stem + ".tmp-", suffix=CACHE_SUFFIX, dir=target.parent
+    ))
+
+    columns = []
+    for i, name in enumerate(df.columns):
+        col = df[name]
+        entry = {"name": name, "file": f"c{i}.npy", "categories": None}
+
+        if col.dtype == object or isinstance(col.dtype, pd.StringDtype):
+            codes, categories = pd.factorize(col, sort=True)
+            code_dtype = np.int16 if len(categories) < np.iinfo(np.int16).max else np.int32
+            values = codes.astype(code_dtype)
+            entry["categories"] = [str(c) for c in categories]
+        elif pd.api.types.is_integer_dtype(col.dtype):
+            values = col.to_numpy()
+            info = np.iinfo(np.int32)
+            if len(values) == 0 or (values.min() >= info.min and values.max() <= info.max):
+                values = values.astype(np.int32)
+        else:
+            values = col.to_numpy()
+
+        np.save(tmp_dir / entry["file"], np.ascontiguousarray(values))
+        columns.append(entry)
+
+    meta = {"format_version": FORMAT_VERSION, "rows": len(df), "columns": columns, **stamp}
+    with open(tmp_dir / META_FILE, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+    # 기존 디렉터리 교체 (이미 mmap 한 프로세스는 unlink 된 파일을 계속 본다)
+    if target.exists():
+        old = target.with_name(target.stem + ".old" + CACHE_SUFFIX)
+        shutil.rmtree(old, ignore_errors=True)
+        os.replace(target, old)
+        os.replace(tmp_dir, target)
+        shutil.rmtree(old, ignore_errors=True)
+    else:
+        os.replace(tmp_dir, target)
+
+    return target
+
+
+def load_cache(csv_path: PathLike) -> pd.DataFrame:
+    """
+    바이너리 사본을 읽기 전용 mmap 으로 열어 DataFrame 으로 반환.
+    숫자 컬럼은 복사 없이 mmap 배열을 그대로 사용하고,
+    사전 인코딩된 컬럼은 Categorical 로 복원한다.
+    """
+    cache_dir = cache_dir_for(csv_path)
+    meta = _read_meta(cache_dir)
+    if meta is None:
+        raise FileNotFoundError(cache_dir / META_FILE)
+
+    data = {}
+    for entry in meta["columns"]:
+        values = np.load(cache_dir / entry["file"], mmap_mode="r")
+        if entry["categories"] is not None:
+            values = pd.Categorical.from_codes(values, categories=entry["categories"])
+        data[entry["name"]] = values
+
+    return pd.DataFrame(data, copy=False)
+
+
+def read_table(csv_path: PathLike) -> pd.DataFrame:
+    """
+    바이너리 사본이 최신이면 mmap 으로, 아니면 CSV 를 파싱해서 반환.
+    """
+    if is_fresh(csv_path):
+        return load_cache(csv_path)
+    return pd.read_csv(csv_path)
+
+
+def build_all() -> None:
+    """Dataset_ML.csv 와 미래 예측 CSV 를 모두 변환"""
+    for path, sort_by in ((DATA_PATH, ["구", "연도"]), (FUTURE_PRED_PATH, ["구", "연도"])):
+        if Path(path).exists():
+            print(f"{path} → {build_cache(path, sort_by=sort_by)}")
+        else:
+            print(f"{path} 없음, 건너뜀")
+
+
+if __name__ == "__main__":
+    build_all()
@@ -0,0 +1,159 @@
+"""
+pybo.ml.executor
+
+- 요청 스레드 대신 작은 스레드 풀에서 예측을 처리하는 micro-batching 실행기
+    - coalescing : 같은 키를 동시에 요청하면 진행 중인 계산 하나(Future)를 같이 기다림
+    - micro-batching : max_wait 안에 들어온 서로 다른 키들을 모아서 fn(keys) 한 번으로 처리
+    - workers 개 배치까지만 동시에 실행 (나머지는 모였다가 다음 배치로 한 번에)
+- 키 / 결과 형식은 fn 이 정한다. 웹 쪽 사용 예는 belong.predictions.predict_and_store
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, List, Optional, Sequence
+
+# 기본 배치 크기 / 모으는 시간(초) / 동시 실행 배치 수
+DEFAULT_MAX_BATCH = 64
+DEFAULT_MAX_WAIT = 0.005
+DEFAULT_WORKERS = 2
+
+BatchFn = Callable[[Sequence[Hashable]], Sequence[object]]
+
+
+class MicroBatcher:
+    """
+    fn(keys) → results (같은 순서, 같은 길이) 를 배치로 실행하는 실행기.
+    결과 원소가 Exception 이면 그 키의 Future 에만 예외로 전달하고,
+    fn 자체가 예외를 내면 배치 전체에 전달한다.
+
+        batcher = MicroBatcher(lambda pairs: loader.predict_many(pairs))
+        result = batcher(("강남구", 2023))        # 동기 호출
+        future = batcher.submit(("강남구", 2023))  # Future
+    """
+
+    def __init__(
+        self,
+        fn: BatchFn,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_wait: float = DEFAULT_MAX_WAIT,
+        workers: int = DEFAULT_WORKERS,
+        name: str = "micro-batcher",
+    ):
+        self.fn = fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.workers = workers
+
+        self._queue: "queue.Queue[Optional[Hashable]]" = queue.Queue()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._slots = threading.Semaphore(workers)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self._closed = False
+
+        self.submitted = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.batched_keys = 0
+
+        self._collector = threading.Thread(
+            target=self._collect, name=f"{name}-collector", daemon=True
+        )
+        self._collector.start()
+
+    def submit(self, key: Hashable) -> Future:
+        """key 의 결과 Future. 같은 key 가 이미 진행 중이면 그 Future 를 그대로 반환."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("종료된 실행기입니다.")
+            self.submitted += 1
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future
+            future = Future()
+            self._inflight[key] = future
+        self._queue.put(key)
+        return future
+
+    def __call__(self, key: Hashable, timeout: Optional[float] = None):
+        return self.submit(key).result(timeout)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "submitted": self.submitted,
+                "coalesced": self.coalesced,
+                "batches": self.batches,
+                "batched_keys": self.batched_keys,
+                "mean_batch": self.batched_keys / self.batches if self.batches else 0.0,
+                "inflight": len(self._inflight),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            self._closed = True
+        self._queue.put(None)
+        if wait:
+            self._collector.join()
+        self._pool.shutdown(wait=wait)
+
+    # ------------------------------------------
+    # 내부: 모으기 / 실행
+    # ------------------------------------------
+    def _collect(self) -> None:
+        while True:
+            key = self._queue.get()
+            if key is None:
+                return
+            batch = [key]
+
+            # 실행 슬롯이 날 때까지 기다리는 동안 들어온 키도 같은 배치로
+            self._slots.acquire()
+            deadline = time.monotonic() + self.max_wait
+            stop = False
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                try:
+                    if timeout > 0:
+                        key = self._queue.get(timeout=timeout)
+                    else:
+                        key = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if key is None:
+                    stop = True
+                    break
+                batch.append(key)
+
+            self._pool.submit(self._run, batch)
+            if stop:
+                return
+
+    def _run(self, keys: List[Hashable]) -> None:
+        try:
+            try:
+                results = list(self.fn(keys))
+                if len(results) != len(keys):
+                    raise RuntimeError(
+                        f"배치 함수가 {len(keys)}개 키에 {len(results)}개 결과를 반환했습니다."
+                    )
+            except Exception as exc:  # 배치 전체에 전달
+                results = [exc] * len(keys)
+
+            with self._lock:
+                self.batches += 1
+                self.batched_keys += len(keys)
+                futures = [self._inflight.pop(key) for key in keys]
+
+            for future, result in zip(futures, results):
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        finally:
+            self._slots.release()
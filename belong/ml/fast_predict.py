@@ -0,0 +1,313 @@
+"""
+pybo.ml.fast_predict
+
+- lonely_death_model.pkl (ColumnTransformer + XGBRegressor 파이프라인)을
+  순수 NumPy 로 평가하는 경량 예측기로 컴파일
+    - StandardScaler 는 입력 컬럼별 (mean, scale) 로 접어서 입력 단계에서 적용
+    - 트리 앙상블은 (트리 수, 노드 수) 패딩 배열로 펼쳐서
+      모든 행 × 모든 트리를 깊이만큼만 반복하며 한 번에 평가
+- lonely_death_model.npz 로 저장 → loader 가 있으면 sklearn / xgboost 없이 사용
+- 원본 파이프라인과의 일치 여부를 export 시점에 검사 (verify_parity)
+  (held-out / NaN / 설정별 반복 검사: python -m benchmarks.check_fast_predict)
+
+사용법:
+    python -m belong.ml.fast_predict    # 현재 MODEL_PATH 를 컴파일해서 저장
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from . import FAST_MODEL_PATH, FINAL_FEATURES, MODEL_PATH
+from .columnar import PathLike
+
+# 원본 파이프라인과의 허용 오차 (같은 순서로 누적하므로 보통 0)
+PARITY_RTOL = 1e-5
+PARITY_ATOL = 1e-4
+
+
+class CompiledModel:
+    """
+    컴파일된 예측기. predict(X) 는 Pipeline.predict 와 같은 값을 (float 오차 내에서) 반환.
+
+    - columns       : 입력 컬럼 이름 (X 의 열 순서)
+    - input_index   : 트리 피처 j 가 읽는 입력 열 번호
+    - mean / scale  : 트리 피처 j 의 표준화 계수 (passthrough 는 0 / 1)
+    - left / right / feature / threshold / default_left / value
+                    : (트리 수, 최대 노드 수) 배열, 잎 노드는 left == -1
+    """
+
+    def __init__(
+        self,
+        columns: Sequence[str],
+        input_index: np.ndarray,
+        mean: np.ndarray,
+        scale: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        default_left: np.ndarray,
+        value: np.ndarray,
+        base_score: float,
+        max_depth: int,
+        source_stamp: Optional[dict] = None,
+    ):
+        self.columns = list(columns)
+        self.input_index = input_index
+        self.mean = mean
+        self.scale = scale
+        self.left = left
+        self.right = right
+        self.feature = feature
+        self.threshold = threshold
+        self.default_left = default_left
+        self.value = value
+        self.base_score = base_score
+        self.max_depth = max_depth
+        self.source_stamp = source_stamp or {}
+
+    # ------------------------------------------
+    # 평가
+    # ------------------------------------------
+    def _inputs(self, X) -> np.ndarray:
+        """원본 입력 → 트리 입력(float32). sklearn 과 같은 순서로 float64 계산 후 변환"""
+        if isinstance(X, pd.DataFrame):
+            X = X[self.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        return ((X[:, self.input_index] - self.mean) / self.scale).astype(np.float32)
+
+    def predict(self, X) -> np.ndarray:
+        Z = self._inputs(X)
+        n_rows = Z.shape[0]
+        n_trees = self.left.shape[0]
+        trees = np.arange(n_trees)
+
+        node = np.zeros((n_rows, n_trees), dtype=np.int32)
+        for _ in range(self.max_depth):
+            left = self.left[trees, node]
+            is_leaf = left < 0
+            fvalue = np.take_along_axis(Z, self.feature[trees, node], axis=1)
+            go_left = np.where(
+                np.isnan(fvalue),
+                self.default_left[trees, node],
+                fvalue < self.threshold[trees, node],
+            )
+            node = np.where(is_leaf, node, np.where(go_left, left, self.right[trees, node]))
+
+        # XGBoost 와 같은 순서(base_score → 트리 0 → 1 ...)로 float32 순차 누적
+        # (cumsum 은 순차 합이라 pairwise 합인 sum 과 달리 결과가 비트 단위로 같다)
+        leaves = np.empty((n_rows, n_trees + 1), dtype=np.float32)
+        leaves[:, 0] = self.base_score
+        leaves[:, 1:] = self.value[trees, node]
+        return np.cumsum(leaves, axis=1, dtype=np.float32)[:, -1]
+
+    # ------------------------------------------
+    # 저장 / 로드
+    # ------------------------------------------
+    def save(self, path: PathLike = FAST_MODEL_PATH) -> None:
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        meta = {
+            "columns": self.columns,
+            "base_score": self.base_score,
+            "max_depth": self.max_depth,
+            "source_stamp": self.source_stamp,
+        }
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                meta=np.frombuffer(json.dumps(meta, ensure_ascii=False).encode(), dtype=np.uint8),
+                input_index=self.input_index,
+                mean=self.mean,
+                scale=self.scale,
+                left=self.left,
+                right=self.right,
+                feature=self.feature,
+                threshold=self.threshold,
+                default_left=self.default_left,
+                value=self.value,
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: PathLike = FAST_MODEL_PATH) -> "CompiledModel":
+        with np.load(path) as data:
+            meta = json.loads(data["meta"].tobytes().decode())
+            arrays = {k: data[k] for k in data.files if k != "meta"}
+        for arr in arrays.values():
+            arr.setflags(write=False)
+        return cls(
+            columns=meta["columns"],
+            base_score=meta["base_score"],
+            max_depth=meta["max_depth"],
+            source_stamp=meta["source_stamp"],
+            **arrays,
+        )
+
+
+def _model_stamp(model_path: PathLike) -> Optional[dict]:
+    try:
+        st = os.stat(model_path)
+    except FileNotFoundError:
+        return None
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _column_spec(preprocess, columns: Sequence[str]):
+    """
+    ColumnTransformer → (입력 열 번호, mean, scale) (트리 피처 순서)
+    지원: StandardScaler, passthrough (FunctionTransformer(func=None) 포함)
+    """
+    from sklearn.preprocessing import FunctionTransformer, StandardScaler
+
+    position = {name: i for i, name in enumerate(columns)}
+    index, mean, scale = [], [], []
+
+    for name, trans, cols in preprocess.transformers_:
+        if trans == "drop" or (name == "remainder" and len(cols) == 0):
+            continue
+        cols = list(cols)
+        if isinstance(trans, StandardScaler):
+            # with_mean / with_std=False 여도 mean_ / var_ 는 계산해 두므로 플래그를 먼저 본다
+            m = trans.mean_ if trans.with_mean and trans.mean_ is not None else np.zeros(len(cols))
+            s = trans.scale_ if trans.with_std and trans.scale_ is not None else np.ones(len(cols))
+        elif trans == "passthrough" or (
+            isinstance(trans, FunctionTransformer) and trans.func is None
+        ):
+            m, s = np.zeros(len(cols)), np.ones(len(cols))
+        else:
+            raise ValueError(f"컴파일할 수 없는 전처리 단계입니다: {name} ({trans!r})")
+
+        index.extend(position[c] for c in cols)
+        mean.extend(np.asarray(m, dtype=np.float64))
+        scale.extend(np.asarray(s, dtype=np.float64))
+
+    return (
+        np.asarray(index, dtype=np.int64),
+        np.asarray(mean, dtype=np.float64),
+        np.asarray(scale, dtype=np.float64),
+    )
+
+
+def _tree_arrays(booster):
+    """XGBoost JSON 모델 → 패딩된 트리 배열 + base_score + 최대 깊이"""
+    model = json.loads(bytes(booster.save_raw(raw_format="json")))
+    learner = model["learner"]
+    if learner["objective"]["name"] != "reg:squarederror":
+        raise ValueError(f"지원하지 않는 objective: {learner['objective']['name']}")
+
+    base_score = float(learner["learner_model_param"]["base_score"].strip("[]"))
+    trees = learner["gradient_booster"]["model"]["trees"]
+    n_nodes = max(len(t["left_children"]) for t in trees)
+
+    shape = (len(trees), n_nodes)
+    left = np.full(shape, -1, dtype=np.int32)
+    right = np.full(shape, -1, dtype=np.int32)
+    feature = np.zeros(shape, dtype=np.int64)
+    threshold = np.zeros(shape, dtype=np.float32)
+    default_left = np.zeros(shape, dtype=bool)
+    value = np.zeros(shape, dtype=np.float32)
+
+    max_depth = 0
+    for t, tree in enumerate(trees):
+        n = len(tree["left_children"])
+        left[t, :n] = tree["left_children"]
+        right[t, :n] = tree["right_children"]
+        feature[t, :n] = tree["split_indices"]
+        # 잎 노드는 split_conditions 에 잎 값이 들어 있다
+        threshold[t, :n] = tree["split_conditions"]
+        value[t, :n] = tree["split_conditions"]
+        default_left[t, :n] = np.asarray(tree["default_left"], dtype=bool)
+
+        depth = np.zeros(n, dtype=np.int32)
+        for node in range(n):
+            for child in (tree["left_children"][node], tree["right_children"][node]):
+                if child >= 0:
+                    depth[child] = depth[node] + 1
+        max_depth = max(max_depth, int(depth.max()))
+
+    return left, right, feature, threshold, default_left, value, base_score, max_depth
+
+
+def compile_pipeline(
+    pipeline,
+    columns: Sequence[str] = FINAL_FEATURES,
+    model_path: PathLike = MODEL_PATH,
+) -> CompiledModel:
+    """
+    학습된 Pipeline(preprocess + model)을 CompiledModel 로 변환.
+    columns 는 predict 에 넘길 입력 열 순서 (FeatureStore.columns 와 동일).
+    """
+    input_index, mean, scale = _column_spec(pipeline.named_steps["preprocess"], columns)
+    booster = pipeline.named_steps["model"].get_booster()
+    left, right, feature, threshold, default_left, value, base_score, max_depth = (
+        _tree_arrays(booster)
+    )
+    return CompiledModel(
+        columns, input_index, mean, scale,
+        left, right, feature, threshold, default_left, value,
+        base_score, max_depth, _model_stamp(model_path),
+    )
+
+
+def verify_parity(pipeline, compiled: CompiledModel, X: pd.DataFrame) -> float:
+    """
+    원본 파이프라인과 컴파일된 예측기의 예측값을 비교.
+    허용 오차를 넘으면 AssertionError, 아니면 최대 절대 오차를 반환.
+    """
+    expected = np.asarray(pipeline.predict(X[compiled.columns]), dtype=np.float64)
+    actual = compiled.predict(X).astype(np.float64)
+    np.testing.assert_allclose(actual, expected, rtol=PARITY_RTOL, atol=PARITY_ATOL)
+    return float(np.max(np.abs(actual - expected))) if len(expected) else 0.0
+
+
+def export_compiled_model(
+    pipeline,
+    X: pd.DataFrame,
+    path: PathLike = FAST_MODEL_PATH,
+    model_path: PathLike = MODEL_PATH,
+) -> float:
+    """
+    컴파일 → X 로 일치 검사 → 저장. 최대 절대 오차를 반환.
+    """
+    compiled = compile_pipeline(pipeline, model_path=model_path)
+    max_err = verify_parity(pipeline, compiled, X)
+    compiled.save(path)
+    return max_err
+
+
+def load_if_fresh(
+    path: PathLike = FAST_MODEL_PATH,
+    model_path: PathLike = MODEL_PATH,
+) -> Optional[CompiledModel]:
+    """
+    컴파일된 예측기가 있고 현재 pkl 에서 만든 것이면 로드, 아니면 None.
+    (pkl 없이 npz 만 배포한 경우도 사용)
+    """
+    if not Path(path).exists():
+        return None
+    compiled = CompiledModel.load(path)
+    stamp = _model_stamp(model_path)
+    if stamp is not None and compiled.source_stamp != stamp:
+        return None  # pkl 이 다시 학습됨 → 원본 파이프라인 사용
+    return compiled
+
+
+if __name__ == "__main__":
+    import joblib
+
+    from .preprocess import build_feature_dataframe
+
+    pipeline = joblib.load(MODEL_PATH)
+    df = build_feature_dataframe()
+    err = export_compiled_model(pipeline, df[FINAL_FEATURES])
+    print(f"{FAST_MODEL_PATH} 저장 완료 (최대 오차 {err:.2e})")
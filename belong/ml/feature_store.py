@@ -0,0 +1,161 @@
+"""
+pybo.ml.feature_store
+
+- build_feature_dataframe 결과를 로드 시점에 한 번만 NumPy 행렬로 변환
+- (구, 연도) → 행 번호 해시 인덱스를 만들어 O(1) 조회
+  (요청 경로는 구 코드 × 연도 int32 격자를 써서 공유 객체의 refcount 를 건드리지 않음
+   → fork 한 워커 사이에서 copy-on-write 가 일어나지 않는다)
+- 요청 경로에서는 DataFrame 마스킹 없이
+  미리 만들어 둔 피처 벡터 / 실제값(TARGET_COL)을 바로 반환
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import FINAL_FEATURES, TARGET_COL
+
+# 파이프라인의 StandardScaler 가 float64 로 계산하므로
+# 저장 dtype 도 float64 로 맞춰야 기존 predict_for 결과와 비트 단위로 같다.
+FEATURE_DTYPE = np.float64
+
+Key = Tuple[str, int]
+
+
+class FeatureStore:
+    """
+    (구, 연도) 단위 피처 저장소.
+
+    - matrix  : (행 수, 피처 수) C-contiguous 행렬 (columns 순서)
+    - targets : 행별 실제값 (TARGET_COL 이 없으면 None)
+    - index   : (구, 연도) → matrix 행 번호 (순회 / 일괄 처리용)
+    - grid    : [구 코드, 연도 - year0] → 행 번호 (-1 은 없음, 요청 경로용)
+    """
+
+    def __init__(
+        self,
+        matrix: np.ndarray,
+        targets: Optional[np.ndarray],
+        index: Dict[Key, int],
+        columns: Sequence[str],
+        regions: List[str],
+        years: List[int],
+    ):
+        self.matrix = matrix
+        self.targets = targets
+        self.index = index
+        self.columns = list(columns)
+        self.regions = regions
+        self.years = years
+
+        # 구 이름 → 코드 (25개 정도라 dict 로 충분), 연도는 year0 기준 오프셋
+        self.gu_codes = {gu: code for code, gu in enumerate(sorted({k[0] for k in index}))}
+        self.year0 = min((k[1] for k in index), default=0)
+        n_years = max((k[1] for k in index), default=-1) - self.year0 + 1
+        grid = np.full((len(self.gu_codes), max(n_years, 0)), -1, dtype=np.int32)
+        for (gu, year), i in index.items():
+            grid[self.gu_codes[gu], year - self.year0] = i
+        grid.setflags(write=False)
+        self.grid = grid
+
+    @classmethod
+    def from_dataframe(
+        cls,
+        df: pd.DataFrame,
+        columns: Sequence[str] = FINAL_FEATURES,
+        target_col: str = TARGET_COL,
+    ) -> "FeatureStore":
+        """
+        build_feature_dataframe 결과로부터 저장소를 만든다.
+        """
+        matrix = np.ascontiguousarray(
+            df[list(columns)].to_numpy(dtype=FEATURE_DTYPE, na_value=np.nan)
+        )
+        matrix.setflags(write=False)
+
+        targets = None
+        if target_col in df.columns:
+            targets = df[target_col].to_numpy(dtype=np.float64, na_value=np.nan)
+            targets.setflags(write=False)
+
+        # 같은 (구, 연도)가 여러 행이면 기존 동작처럼 첫 번째 행을 사용
+        index: Dict[Key, int] = {}
+        years_col = df["연도"]
+        for i, (gu, year) in enumerate(zip(df["구"].tolist(), years_col.tolist())):
+            if pd.isna(year):
+                continue
+            index.setdefault((gu, int(year)), i)
+
+        regions = sorted(df["구"].unique().tolist())
+        years = sorted(years_col.dropna().astype(int).unique().tolist())
+
+        return cls(matrix, targets, index, columns, regions, years)
+
+    def extend(self, df: pd.DataFrame) -> "FeatureStore":
+        """
+        새 피처 행들을 뒤에 붙인 새 저장소를 반환 (기존 행 번호는 그대로).
+        이미 있는 (구, 연도)가 들어오면 ValueError.
+        """
+        other = FeatureStore.from_dataframe(df, self.columns)
+        offset = len(self)
+
+        index = dict(self.index)
+        for key, i in other.index.items():
+            if key in index:
+                raise ValueError(f"이미 존재하는 (구, 연도) 조합입니다: {key}")
+            index[key] = i + offset
+
+        matrix = np.vstack([self.matrix, other.matrix])
+        matrix.setflags(write=False)
+        targets = None
+        if self.targets is not None and other.targets is not None:
+            targets = np.concatenate([self.targets, other.targets])
+            targets.setflags(write=False)
+
+        regions = sorted(set(self.regions) | set(other.regions))
+        years = sorted(set(self.years) | set(other.years))
+        return FeatureStore(matrix, targets, index, self.columns, regions, years)
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def __contains__(self, key: Key) -> bool:
+        return key in self.index
+
+    def row_of(self, gu: str, year: int) -> int:
+        """
+        (구, 연도)의 행 번호. 없으면 ValueError.
+        """
+        code = self.gu_codes.get(gu)
+        offset = int(year) - self.year0
+        i = -1
+        if code is not None and 0 <= offset < self.grid.shape[1]:
+            i = int(self.grid[code, offset])
+        if i < 0:
+            raise ValueError(f"데이터에 존재하지 않는 (구, 연도) 조합입니다: ({gu}, {year})")
+        return i
+
+    def rows_of(self, gus: Sequence[str], years: Sequence[int]) -> np.ndarray:
+        """
+        여러 (구, 연도)의 행 번호를 한 번에 반환. 없는 조합은 -1.
+        """
+        codes = np.fromiter(
+            (self.gu_codes.get(gu, -1) for gu in gus), dtype=np.int64, count=len(gus)
+        )
+        offsets = np.asarray(years, dtype=np.int64) - self.year0
+        valid = (codes >= 0) & (offsets >= 0) & (offsets < self.grid.shape[1])
+
+        rows = np.full(len(codes), -1, dtype=np.int64)
+        rows[valid] = self.grid[codes[valid], offsets[valid]]
+        return rows
+
+    def lookup(self, gu: str, year: int) -> Tuple[np.ndarray, Optional[float]]:
+        """
+        (구, 연도)의 피처 벡터(읽기 전용 view)와 실제값을 반환.
+        """
+        i = self.row_of(gu, year)
+        y_true = None if self.targets is None else float(self.targets[i])
+        return self.matrix[i], y_true
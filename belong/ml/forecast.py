@@ -0,0 +1,151 @@
+"""
+pybo.ml.forecast
+
+- 노트북에서 만들던 미래 예측 CSV(2026~2075)를 서비스 안에서 재생성하는 재귀 예측 엔진
+- 외생 피처(노령화지수, 1인가구_비율 ...)는 구별 선형 추세로 연장 (v1.1 linear 와 같은 방식)
+- lag_1 은 전년도 예측값으로 한 해씩 굴려 가며,
+  매 연도마다 모든 구를 (구 수, 피처 수) 행렬 하나로 묶어 model.predict 한 번만 호출
+- 결과 CSV 는 임시 파일에 쓴 뒤 교체 (읽는 쪽이 반쯤 쓰인 파일을 보지 않음)
+
+사용법:
+    flask --app belong predict forecast --start 2026 --end 2075
+    python -m belong.ml.forecast
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from . import FINAL_FEATURES, FUTURE_PRED_PATH, NUMERIC_FEATURES, TARGET_COL
+from .columnar import PathLike, build_cache, cache_dir_for
+from .future_store import PRED_COL
+
+DEFAULT_START_YEAR = 2026
+DEFAULT_END_YEAR = 2075
+
+# 연도 / lag_1 은 매 스텝 직접 채우고, 나머지 수치형 피처는 추세로 연장
+EXOGENOUS_FEATURES = [c for c in NUMERIC_FEATURES if c not in ("연도", "lag_1")]
+
+# 추세 기울기 계산 시 연도 기준점 (큰 연도 값 제곱으로 인한 정밀도 손실 방지)
+_YEAR_ORIGIN = 2000.0
+
+
+def _linear_trends(history: pd.DataFrame, codes: np.ndarray, n_groups: int, columns):
+    """
+    구별 최소제곱 직선 (연도 → 피처) 의 (절편, 기울기).
+    bincount 로 구별 합계만 모아 닫힌 식으로 계산 (구 × 컬럼 반복 없음).
+    관측이 1개뿐이거나 연도가 모두 같으면 기울기 0 (마지막 값 유지에 가까움).
+    """
+    x = history["연도"].to_numpy(dtype=np.float64) - _YEAR_ORIGIN
+    intercept = np.zeros((n_groups, len(columns)))
+    slope = np.zeros((n_groups, len(columns)))
+
+    for j, col in enumerate(columns):
+        y = history[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        ok = ~np.isnan(y)
+        c, xs, ys = codes[ok], x[ok], y[ok]
+        n = np.bincount(c, minlength=n_groups).astype(np.float64)
+        sx = np.bincount(c, xs, n_groups)
+        sy = np.bincount(c, ys, n_groups)
+        sxx = np.bincount(c, xs * xs, n_groups)
+        sxy = np.bincount(c, xs * ys, n_groups)
+
+        den = n * sxx - sx * sx
+        with np.errstate(divide="ignore", invalid="ignore"):
+            b = np.where(np.abs(den) > 1e-12, (n * sxy - sx * sy) / den, 0.0)
+            a = np.where(n > 0, (sy - b * sx) / n, np.nan)
+        intercept[:, j] = a
+        slope[:, j] = b
+
+    return intercept, slope
+
+
+def recursive_forecast(
+    df_features: pd.DataFrame,
+    model,
+    start_year: int = DEFAULT_START_YEAR,
+    end_year: int = DEFAULT_END_YEAR,
+    columns: Sequence[str] = FINAL_FEATURES,
+) -> pd.DataFrame:
+    """
+    df_features(add_engineered_features 결과)와 학습된 모델로
+    마지막 관측 연도 다음 해부터 end_year 까지 재귀 예측하고,
+    start_year 이후 행만 [구, 연도, 예측값] DataFrame 으로 반환 ((구, 연도) 정렬).
+
+    - 연도 y 의 lag_1 = 연도 y-1 의 예측값 (첫 해는 마지막 실제값)
+    - 외생 피처 = 구별 선형 추세값 (음수는 0 으로 자름)
+    - 예측값도 0 미만이면 0 (인원수)
+    """
+    columns = list(columns)
+    history = df_features[df_features["연도"].notna() & df_features["구"].notna()]
+    history = history.sort_values(["구", "연도"], kind="mergesort")
+    codes, gus = pd.factorize(history["구"], sort=True)
+    n_groups = len(gus)
+
+    # 구별 마지막 관측 행 = 예측 입력 행렬의 시작값 (원-핫 컬럼 포함)
+    last = history.groupby(codes, sort=True).tail(1)
+    X = last[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    lag = last[TARGET_COL].to_numpy(dtype=np.float64, na_value=np.nan)
+    first_year = int(last["연도"].max()) + 1
+
+    exog_idx = [columns.index(c) for c in EXOGENOUS_FEATURES]
+    intercept, slope = _linear_trends(history, codes, n_groups, EXOGENOUS_FEATURES)
+    year_idx = columns.index("연도")
+    lag_idx = columns.index("lag_1")
+
+    years = np.arange(first_year, end_year + 1)
+    out = np.empty((len(years), n_groups))
+    for step, year in enumerate(years):
+        X[:, year_idx] = year
+        X[:, exog_idx] = np.maximum(intercept + slope * (year - _YEAR_ORIGIN), 0.0)
+        X[:, lag_idx] = lag
+        lag = np.maximum(_predict(model, X, columns), 0.0)
+        out[step] = lag
+
+    keep = years >= start_year
+    return pd.DataFrame({
+        "구": np.repeat(np.asarray(gus, dtype=object), keep.sum()),
+        "연도": np.tile(years[keep], n_groups),
+        PRED_COL: out[keep].T.ravel(),
+    })
+
+
+def _predict(model, X: np.ndarray, columns) -> np.ndarray:
+    frame = pd.DataFrame(X, columns=columns, copy=False)
+    return np.asarray(model.predict(frame), dtype=np.float64)
+
+
+def write_future_csv(df: pd.DataFrame, path: PathLike = FUTURE_PRED_PATH) -> Path:
+    """
+    미래 예측 CSV 를 원자적으로 교체.
+    같은 디렉터리 임시 파일에 쓴 뒤 os.replace, 바이너리 사본(columnar)이 있으면 같이 갱신.
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            df.to_csv(f, index=False)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+    if cache_dir_for(path).exists():
+        build_cache(path, sort_by=["구", "연도"])
+    return path
+
+
+if __name__ == "__main__":
+    import time
+
+    from . import loader
+
+    started = time.perf_counter()
+    n = loader.regenerate_future_store()
+    print(f"{FUTURE_PRED_PATH} 저장 완료 ({n}행, {time.perf_counter() - started:.3f}s)")
@@ -0,0 +1,120 @@
+"""
+pybo.ml.future_payload
+
+- 미래 예측 곡선을 차트용 columnar JSON 으로 미리 직렬화
+    - 구 하나 : {"gu", "years": [...], "values": [...], "rounded": [...]}
+    - 전체 구 : {"years": [...] (한 번만), "regions": [...], "values": [[구별 값]...], "rounded": [...]}
+    - values 는 연도 순 숫자 배열 (JS 에서 Float64Array.from 으로 바로 typed array)
+- FutureStore 를 로드할 때 한 번만 만들고, 요청 경로에서는 bytes 를 그대로 돌려준다
+    - identity / gzip / (brotli 모듈이 있으면) br 세 가지를 미리 압축
+    - orjson 이 있으면 orjson, 없으면 표준 json 으로 직렬화 (출력 형식은 같음)
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from .future_store import FutureStore
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+ALL_KEY = "all"
+
+# 값은 소수 4자리까지 (화면 표시는 2자리, 차트 보간에는 충분)
+FLOAT_DECIMALS = 4
+
+
+class EncodedPayload(NamedTuple):
+    """
+    미리 직렬화 / 압축한 JSON 응답 본문.
+    etag 는 identity 본문 기준이고, 인코딩별로 접미사를 붙여 쓴다 (strong ETag).
+    """
+    etag: str
+    identity: bytes
+    gzip: bytes
+    br: Optional[bytes]
+
+    def body(self, encoding: Optional[str]) -> bytes:
+        if encoding == "br":
+            return self.br
+        if encoding == "gzip":
+            return self.gzip
+        return self.identity
+
+
+def _dumps(obj: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+
+def encode(obj: Dict[str, Any]) -> EncodedPayload:
+    raw = _dumps(obj)
+    return EncodedPayload(
+        etag=hashlib.sha256(raw).hexdigest()[:32],
+        identity=raw,
+        # mtime=0 → 같은 내용이면 같은 bytes (재시작 후에도 동일)
+        gzip=gzip.compress(raw, compresslevel=9, mtime=0),
+        br=brotli.compress(raw, quality=11) if brotli is not None else None,
+    )
+
+
+def _values(arr: np.ndarray) -> List[Optional[float]]:
+    """NaN 은 JSON 에 없으므로 null 로"""
+    rounded = np.round(arr.astype(np.float64), FLOAT_DECIMALS)
+    if np.isnan(rounded).any():
+        return [None if np.isnan(v) else v for v in rounded.tolist()]
+    return rounded.tolist()
+
+
+def _aligned(curve_years: np.ndarray, arr: np.ndarray, years: np.ndarray) -> List[Any]:
+    """구 곡선을 전체 연도 축에 맞춘 리스트 (빠진 연도는 null). 보통은 그대로."""
+    items = arr.tolist() if arr.dtype.kind in "iu" else _values(arr)
+    if np.array_equal(curve_years, years):
+        return items
+    out: List[Any] = [None] * len(years)
+    for i, v in zip(np.searchsorted(years, curve_years).tolist(), items):
+        out[i] = v
+    return out
+
+
+def build_payloads(store: FutureStore) -> Dict[str, EncodedPayload]:
+    """
+    구 이름 → 그 구의 payload, ALL_KEY → 전체 구 payload.
+    """
+    payloads: Dict[str, EncodedPayload] = {}
+    regions = store.regions()
+    years = np.asarray(store.years, dtype=np.int64)
+
+    all_values, all_rounded = [], []
+    for gu in regions:
+        curve = store.curves[gu]
+        payloads[gu] = encode({
+            "gu": gu,
+            "years": curve.years.tolist(),
+            "values": _values(curve.values),
+            "rounded": curve.rounded.tolist(),
+        })
+        all_values.append(_aligned(curve.years, curve.values, years))
+        all_rounded.append(_aligned(curve.years, curve.rounded, years))
+
+    payloads[ALL_KEY] = encode({
+        "years": years.tolist(),
+        "regions": regions,
+        "values": all_values,
+        "rounded": all_rounded,
+    })
+    return payloads
@@ -0,0 +1,114 @@
+"""
+pybo.ml.future_store
+
+- 2026~2075 미래 예측 CSV 를 한 번만 읽어서
+  구별로 미리 나눠 둔 (연도 정렬, 반올림 완료) NumPy 배열로 보관
+- 요청 경로에서는 DataFrame 필터링 / 복사 없이 구 하나의 곡선을 바로 반환
+- 원본 DataFrame 은 보관하지 않고 배열만 남긴다 (예전 DataFrame 두 벌 대비 메모리 절감)
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from .columnar import PathLike, read_table
+
+PRED_COL = "예측값"
+REQUIRED_COLUMNS = {"구", "연도", PRED_COL}
+
+
+class FutureCurve(NamedTuple):
+    """
+    구 하나의 미래 예측 곡선 (모두 연도 오름차순, 읽기 전용).
+
+    - years   : 연도 (int32)
+    - values  : 예측값 (float64)
+    - rounded : 명 단위 반올림 값 (int32)
+    """
+    years: np.ndarray
+    values: np.ndarray
+    rounded: np.ndarray
+
+
+class FutureStore:
+    """
+    구 → FutureCurve 저장소.
+    구별 배열은 전체 배열 하나를 (구, 연도) 순으로 정렬한 뒤 자른 view 다.
+    """
+
+    def __init__(self, curves: Dict[str, FutureCurve], years: List[int]):
+        self.curves = curves
+        self.years = years
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "FutureStore":
+        if not REQUIRED_COLUMNS.issubset(df.columns):
+            raise ValueError(
+                f"미래 예측 CSV에 {REQUIRED_COLUMNS} 컬럼이 필요합니다. "
+                f"현재 컬럼: {list(df.columns)}"
+            )
+
+        years = pd.to_numeric(df["연도"], errors="coerce")
+        value_all = pd.to_numeric(df[PRED_COL], errors="coerce").to_numpy(
+            dtype=np.float64, na_value=np.nan
+        )
+        # 연도나 예측값이 빈 행은 곡선에서 뺀다
+        # (NaN 을 int32 로 반올림하면 INT_MIN 같은 쓰레기 값이 "예측값_명" 으로 나간다)
+        valid = years.notna().to_numpy() & ~np.isnan(value_all)
+
+        gu_all = df["구"].to_numpy()
+        if not valid.all():
+            gu_all, years, value_all = gu_all[valid], years[valid], value_all[valid]
+        year_all = years.to_numpy().astype(np.int32, copy=False)
+
+        # (구, 연도) 순 정렬 → 구 경계로 잘라서 view 로 보관
+        # (columnar 사본처럼 이미 정렬돼 있고 연도가 int32 / 예측값이 float64 로 저장돼 있으면
+        #  변환 / 재배열 복사가 없어 연도 / 예측값은 mmap 페이지를 그대로 공유.
+        #  반올림 값만 프로세스마다 새로 만든다)
+        gu_codes, gu_names = pd.factorize(gu_all, sort=True)
+        order = np.lexsort((year_all, gu_codes))
+        if not np.array_equal(order, np.arange(len(order))):
+            gu_codes = gu_codes[order]
+            year_all = year_all[order]
+            value_all = value_all[order]
+        rounded_all = np.rint(value_all).astype(np.int32)
+
+        for arr in (year_all, value_all, rounded_all):
+            if arr.flags.writeable:
+                arr.setflags(write=False)
+
+        bounds = np.searchsorted(gu_codes, np.arange(len(gu_names) + 1))
+        curves: Dict[str, FutureCurve] = {}
+        for code, gu in enumerate(gu_names.tolist()):
+            lo, hi = bounds[code], bounds[code + 1]
+            curves[gu] = FutureCurve(year_all[lo:hi], value_all[lo:hi], rounded_all[lo:hi])
+
+        return cls(curves, sorted(np.unique(year_all).tolist()))
+
+    @classmethod
+    def from_csv(cls, path: PathLike) -> "FutureStore":
+        return cls.from_dataframe(read_table(path))
+
+    def regions(self) -> List[str]:
+        return sorted(self.curves)
+
+    def curve(self, gu: str) -> Optional[FutureCurve]:
+        return self.curves.get(gu)
+
+    def records(self, gu: str) -> List[Dict[str, Any]]:
+        """
+        구 하나의 곡선을 템플릿용 records 로 변환.
+        [{"구", "연도", "예측값", "예측값_명"}, ...] (DataFrame 없이 배열 zip 만 수행)
+        """
+        curve = self.curves.get(gu)
+        if curve is None:
+            return []
+        return [
+            {"구": gu, "연도": y, "예측값": v, "예측값_명": r}
+            for y, v, r in zip(
+                curve.years.tolist(), curve.values.tolist(), curve.rounded.tolist()
+            )
+        ]
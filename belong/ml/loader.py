@@ -1,17 +1,35 @@
 """
 pybo.ml.loader
 
-- 학습된 lonely_death_model.pkl 을 로딩
+- 학습된 모델을 로딩 (registry 활성 버전, 없으면 lonely_death_model.pkl)
 - Dataset_ML 기반 피처 DataFrame 로딩
+- 전체 (구, 연도)에 대한 예측값을 한 번에 미리 계산
+  (CSV / 모델 버전이 바뀌면 자동으로 다시 계산, 모델만 바뀌면 피처는 재사용)
+- 모두 처음 사용할 때 스레드 안전하게 로드 (import 만으로는 파일을 읽지 않음)
+  → /question, /auth 만 쓰는 프로세스나 CSV 가 없는 환경에서도 앱이 뜬다.
 - Flask 뷰에서 바로 쓸 수 있는 헬퍼 함수 제공:
     - available_regions()
     - available_years()
+    - feature_vector_for(gu, year)
     - predict_for(gu, year)
+    - prediction_table()
+    - predict_many(pairs) / all_predictions()
+    - data_version() / model_version()
+    - warmup()
+    - append_rows(new_raw) / check_consistency()
+    - get_future_curve_for_gu(gu) / future_store()
+    - regenerate_future_store()
 """
 
 from __future__ import annotations
 
-from typing import Dict, Any
+import functools
+import logging
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
 
 import joblib
 import numpy as np
@@ -19,63 +37,379 @@ import pandas as pd
 
 from . import (
     DATA_PATH,
-    MODEL_PATH,
-    TARGET_COL,
-    FINAL_FEATURES,
     FUTURE_PRED_PATH
 )
-from .preprocess import build_feature_dataframe
+from . import registry
+from .fast_predict import load_if_fresh
+from .forecast import (
+    DEFAULT_END_YEAR,
+    DEFAULT_START_YEAR,
+    recursive_forecast,
+    write_future_csv,
+)
+from .feature_store import FeatureStore, Key
+from .future_payload import ALL_KEY, EncodedPayload, build_payloads
+from .future_store import FutureStore
+from .preprocess import (
+    add_engineered_features,
+    engineer_new_rows,
+    load_raw_data,
+    tail_rows,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class _Snapshot(NamedTuple):
+    """
+    한 시점의 데이터/모델 묶음.
+    재로딩 시 통째로 교체해서 요청 중간에 섞이지 않게 한다.
+    """
+    signature: Tuple[Optional[int], ...]
+    df_features: pd.DataFrame
+    store: FeatureStore
+    model: Any
+    model_version: Optional[str]           # registry 버전 이름 (예측값 / DB 캐시 스탬프)
+    predictions: Optional[np.ndarray]      # store 행 순서와 같은 예측값
+    table: Mapping[Key, float]             # (구, 연도) → 예측값 (읽기 전용)
+    raw_tail: pd.DataFrame                 # 구별 마지막 원본 행들 (증분 반영용)
+    generation: int = 0                    # 같은 CSV 서명 위에서 append_rows 한 횟수
+
+
+# 계측 훅 (belong.instrumentation): observer(이름, 초) 를 등록하면
+# 예측 / 추론 함수 실행 시간을 받는다. 비어 있으면 시간 측정도 하지 않는다.
+timing_observers: List[Callable[[str, float], None]] = []
+
+
+def _observed(name: str):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not timing_observers:
+                return fn(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                for observer in timing_observers:
+                    observer(name, elapsed)
+        return wrapper
+    return decorator
+
+
+def _mtime(path) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _source_signature() -> Tuple[Optional[int], ...]:
+    """
+    (CSV mtime, *모델 서명). 모델 서명은 registry CURRENT 의 mtime
+    (레지스트리를 안 쓰면 모델 pkl / 컴파일된 모델의 mtime).
+    하나라도 바뀌면 사전 계산 테이블을 다시 만든다.
+    """
+    return (_mtime(DATA_PATH),) + registry.signature()
+
+
+def precompute_predictions(model, store: FeatureStore) -> Optional[np.ndarray]:
+    """
+    저장소의 모든 행을 한 번의 model.predict 로 예측해서
+    store 행 순서와 같은 읽기 전용 배열로 반환.
+    """
+    if model is None or len(store) == 0:
+        return None
+
+    predictions = _predict_matrix(model, store.matrix, store.columns)
+    predictions.setflags(write=False)
+    return predictions
+
+
+@_observed("ml.inference")
+def _predict_matrix(model, matrix: np.ndarray, columns) -> np.ndarray:
+    X = pd.DataFrame(matrix, columns=columns, copy=False)
+    return np.asarray(model.predict(X), dtype=np.float64)
+
+
+def _load_model() -> Tuple[Any, Optional[str]]:
+    """
+    (모델, 버전 이름). 아직 학습 안했거나 pkl 이 없으면 (None, None).
+    레지스트리 버전은 로드 전에 체크섬을 검사한다 (불일치 시 ValueError).
+    """
+    artifact = registry.resolve()
+    if artifact is None:
+        return None, None
+
+    # 컴파일된 예측기가 최신이면 sklearn / xgboost 를 import 하지 않고 사용
+    model = load_if_fresh(artifact.fast_path, artifact.model_path)
+    if model is None:
+        try:
+            model = joblib.load(artifact.model_path)
+        except FileNotFoundError:
+            return None, None
+    return model, artifact.version
+
+
+def _build_snapshot(previous: Optional[_Snapshot] = None) -> _Snapshot:
+    """
+    새 스냅샷을 만든다.
+    previous 와 CSV 가 같으면(모델만 교체) 피처 / 저장소는 그대로 두고
+    모델 로드 + 예측값 재계산만 한다.
+    """
+    signature = _source_signature()
+
+    if previous is not None and previous.signature[0] == signature[0]:
+        df_features, store, tail = previous.df_features, previous.store, previous.raw_tail
+        generation = previous.generation   # 증분 반영한 행도 그대로 재사용
+    else:
+        raw = load_raw_data(DATA_PATH)
+        df_features = add_engineered_features(raw)
+        store = FeatureStore.from_dataframe(df_features)
+        tail = tail_rows(raw)
+        generation = 0
+
+    model, version = _load_model()
+    predictions = precompute_predictions(model, store)
+    table: Dict[Key, float] = {}
+    if predictions is not None:
+        table = {key: float(predictions[i]) for key, i in store.index.items()}
+
+    return _Snapshot(
+        signature, df_features, store, model, version, predictions,
+        MappingProxyType(table), tail, generation,
+    )
+
+
+# 증분 반영(append_rows)이 첫 로드 때 _current() 를 안에서 부르므로 재진입 가능한 lock
+_reload_lock = threading.RLock()
+
+# import 시점에는 아무것도 읽지 않고, 처음 사용할 때 한 번 로드 (warmup 으로 미리 가능)
+_snapshot: Optional[_Snapshot] = None
+_failed_signature: Optional[Tuple[Optional[int], ...]] = None  # 재로드에 실패한 서명 (바뀔 때까지 재시도 안 함)
+_df_features: Optional[pd.DataFrame] = None
+_model = None
+
+
+def _current() -> _Snapshot:
+    """
+    현재 스냅샷을 반환.
+    아직 로드 전이거나 CSV / 모델 버전이 바뀌었으면 (한 스레드만) 다시 만든 뒤 반환한다.
+    새 스냅샷은 다 만든 다음 참조 하나만 바꿔 끼우므로
+    교체 중에도 요청은 이전 모델로 끝까지 처리된다. (재시작 없는 hot-swap)
+
+    다시 만들다 실패하면(체크섬 불일치, 모델 로드 실패 등) 로그만 남기고
+    서명이 또 바뀔 때까지 이전 스냅샷을 계속 쓴다. 이전 스냅샷이 없으면 예외.
+    """
+    global _snapshot, _df_features, _model, _failed_signature
+
+    snapshot = _snapshot
+    signature = _source_signature()
+    if snapshot is not None and signature in (snapshot.signature, _failed_signature):
+        return snapshot
+
+    with _reload_lock:
+        signature = _source_signature()
+        if _snapshot is not None and signature in (_snapshot.signature, _failed_signature):
+            return _snapshot
+        try:
+            snapshot = _build_snapshot(_snapshot)
+        except Exception:
+            if _snapshot is None:
+                raise
+            logger.exception(
+                "ML 스냅샷 재로드 실패 (서명 %s) → 이전 모델 %s 로 계속 서비스",
+                signature, _snapshot.model_version,
+            )
+            _failed_signature = signature
+            return _snapshot
+
+        _snapshot = snapshot
+        _failed_signature = None
+        _df_features = _snapshot.df_features
+        _model = _snapshot.model
+        return _snapshot
+
+
+def warmup() -> None:
+    """
+    피처 / 모델 / 사전 계산 예측값 / 미래 예측 저장소를 지금 바로 로드.
+    preforking 서버에서는 master 에서 fork 전에 호출해 두면
+    워커마다 다시 로드하지 않는다. (config.ML_EAGER_LOAD)
+    """
+    _current()
+    _load_future_store()
+
+
+def append_rows(new_raw: pd.DataFrame, csv_mtime: Optional[int] = None) -> int:
+    """
+    새 연도의 원본 행(Dataset_ML.csv 와 같은 컬럼)을 증분 반영하고
+    추가된 피처 행 수를 반환.
+
+    - lag/roll 은 구별 마지막 원본 행(raw_tail) 뒤에 이어서 계산
+    - 피처 저장소 / 사전 계산 예측값은 새 행만 추가 (기존 행은 그대로)
+    - 현재 스냅샷을 다시 검증하지 않고 그대로 이어 붙인다.
+      CSV 서명은 csv_mtime (생략하면 호출 시점의 Dataset_ML.csv mtime) 으로 바꾼다.
+
+    사용 순서: Dataset_ML.csv 에 같은 행을 먼저 덧붙이고(또는 CSV 는 그대로 두고) 호출.
+    반영할 때마다 generation 이 늘어서 data_version() 이 바뀐다
+    (CSV 를 그대로 둔 경우에도 /predict 페이지 캐시 / 예측 캐시가 갱신된다).
+    호출 뒤에 CSV 를 고치면 mtime 이 바뀌므로 다음 요청에서 전체 재계산된다.
+    그 사이 다른 요청이 이미 전체 재계산으로 새 행을 반영했으면 아무것도 하지 않고 0.
+    """
+    global _snapshot, _df_features
+
+    with _reload_lock:
+        snapshot = _snapshot if _snapshot is not None else _current()
+        if csv_mtime is None:
+            csv_mtime = _mtime(DATA_PATH)
+
+        new_raw = new_raw.assign(
+            연도=pd.to_numeric(new_raw["연도"], errors="coerce").astype("Int64")
+        )
+        keys = list(zip(new_raw["구"].tolist(), new_raw["연도"].tolist()))
+        if keys and all(key in snapshot.store.index for key in keys):
+            return 0
+
+        new_features = engineer_new_rows(snapshot.raw_tail, new_raw)
+        store = snapshot.store.extend(new_features)
+
+        predictions = snapshot.predictions
+        table = snapshot.table
+        if snapshot.model is not None and len(new_features):
+            if predictions is None:
+                # 이전 저장소가 비어 있었으면 전체를 한 번에 예측
+                predictions = precompute_predictions(snapshot.model, store)
+            else:
+                new_pred = _predict_matrix(
+                    snapshot.model, store.matrix[len(snapshot.store):], store.columns
+                )
+                predictions = np.concatenate([predictions, new_pred])
+                predictions.setflags(write=False)
+            table = dict(snapshot.table)
+            for (gu, year), i in store.index.items():
+                if i >= len(snapshot.store):
+                    table[(gu, year)] = float(predictions[i])
+            table = MappingProxyType(table)
+
+        _snapshot = snapshot._replace(
+            signature=(csv_mtime,) + snapshot.signature[1:],
+            df_features=pd.concat([snapshot.df_features, new_features], ignore_index=True),
+            store=store,
+            predictions=predictions,
+            table=table,
+            raw_tail=tail_rows(pd.concat([snapshot.raw_tail, new_raw], ignore_index=True)),
+            # CSV 를 그대로 두고 반영해도 data_version() 이 바뀌도록
+            generation=snapshot.generation + 1,
+        )
+        _df_features = _snapshot.df_features
+        return len(new_features)
+
+
+def check_consistency(raw: Optional[pd.DataFrame] = None) -> List[Key]:
+    """
+    현재(증분 반영된) 스냅샷을 전체 재계산 결과와 비교해서
+    피처 벡터나 예측값이 다른 (구, 연도) 목록을 반환. 빈 리스트면 일치.
+    raw 를 주지 않으면 Dataset_ML.csv 를 다시 읽어서 비교한다.
+    """
+    snapshot = _current()
+    if raw is None:
+        raw = load_raw_data(DATA_PATH)
+
+    full = FeatureStore.from_dataframe(add_engineered_features(raw))
+    full_pred = precompute_predictions(snapshot.model, full)
 
-# 모듈 import 시점에 한 번만 로드해서 캐시처럼 사용
-_df_features = build_feature_dataframe(DATA_PATH)
+    mismatched = sorted(set(full.index) ^ set(snapshot.store.index))
+    for key, i in full.index.items():
+        j = snapshot.store.index.get(key)
+        if j is None:
+            continue
+        same = np.array_equal(full.matrix[i], snapshot.store.matrix[j], equal_nan=True)
+        if same and full_pred is not None:
+            same = full_pred[i] == snapshot.predictions[j]
+        if not same:
+            mismatched.append(key)
+    return mismatched
 
-try:
-    _model = joblib.load(MODEL_PATH)
-except FileNotFoundError:
-    _model = None  # 아직 학습 안했거나 pkl 없음
+
+def data_version() -> str:
+    """
+    현재 로드된 CSV / 모델의 버전 문자열 (CSV mtime + 모델 버전 + 증분 반영 횟수).
+    값이 바뀌면 예측값 / 구·연도 목록이 바뀌었을 수 있으므로 캐시를 비워야 한다.
+    """
+    snapshot = _current()
+    return f"{snapshot.signature[0]}-{snapshot.model_version}-{snapshot.generation}"
+
+
+def model_version() -> Optional[str]:
+    """
+    현재 예측에 쓰는 모델 버전 이름 (registry). 모델이 없으면 None.
+    """
+    return _current().model_version
+
+
+def prediction_table() -> Mapping[Key, float]:
+    """
+    모든 (구, 연도)에 대한 사전 계산 예측값 (읽기 전용 매핑).
+    """
+    return _current().table
 
 # ==========================================
 # v1.x: 2026~2075년 장기 예측 CSV 로드
-#  - 노트북에서 미리 생성한 future_pred_*.csv 를 읽어서
-#    Flask 뷰에서 바로 사용할 수 있게 준비한다.
+#  - future_pred_*.csv 를 한 번만 읽어서
+#    구별로 정렬/반올림된 배열로 나눠 둔다. (FutureStore)
+#  - CSV 가 다시 생성되면(mtime 변경) 다음 조회 때 다시 읽는다. (forecast 모듈)
 # ==========================================
-try:
-    _future_df = pd.read_csv(FUTURE_PRED_PATH)
-
-    # 최소한의 검증: 필요한 컬럼이 있는지 확인
-    required_cols = {"구", "연도", "예측값"}
-    if not required_cols.issubset(_future_df.columns):
-        raise ValueError(
-            f"미래 예측 CSV에 {required_cols} 컬럼이 필요합니다. "
-            f"현재 컬럼: {list(_future_df.columns)}"
-        )
+_future_lock = threading.Lock()
+_future_store: Optional[FutureStore] = None
+_future_signature: Optional[Tuple[Optional[int]]] = None  # None = 아직 로드 전
+_future_payloads: Dict[str, EncodedPayload] = {}  # 구 / ALL_KEY → 미리 직렬화한 JSON
 
-    # 연도 타입 정리
-    _future_df["연도"] = (
-        pd.to_numeric(_future_df["연도"], errors="coerce")
-        .astype("Int64")
-    )
 
-except FileNotFoundError:
-    _future_df = None  # 파일이 아직 없으면, 뷰에서 에러 처리
+def _load_future_store() -> Optional[FutureStore]:
+    """처음 호출될 때 / CSV 가 바뀌었을 때만 로드. 파일이 없으면 None (뷰에서 에러 처리)"""
+    global _future_store, _future_signature, _future_payloads
+
+    signature = (_mtime(FUTURE_PRED_PATH),)
+    if _future_signature == signature:
+        return _future_store
+
+    with _future_lock:
+        if _future_signature != signature:
+            try:
+                _future_store = FutureStore.from_csv(FUTURE_PRED_PATH)
+            except FileNotFoundError:
+                _future_store = None
+            # JSON API 본문도 로드할 때 한 번만 직렬화 / 압축
+            _future_payloads = build_payloads(_future_store) if _future_store is not None else {}
+            _future_signature = signature
+        return _future_store
 
 
 def available_regions():
     """
     예측 가능한 자치구 목록을 반환.
     """
-    gu_list = sorted(_df_features["구"].unique().tolist())
-    return gu_list
+    return list(_current().store.regions)
 
 
 def available_years():
     """
     예측 가능한 연도 목록을 반환.
     """
-    year_list = sorted(_df_features["연도"].dropna().astype(int).unique().tolist())
-    return year_list
+    return list(_current().store.years)
+
 
+def feature_vector_for(gu: str, year: int) -> Tuple[np.ndarray, Optional[float]]:
+    """
+    (구, 연도)의 FINAL_FEATURES 벡터(읽기 전용)와 실제값(TARGET_COL)을 반환.
+    DataFrame 을 거치지 않고 해시 인덱스로 바로 찾는다.
+    """
+    return _current().store.lookup(gu, year)
 
+
+@_observed("ml.predict_for")
 def predict_for(gu: str, year: int) -> Dict[str, Any]:
     """
     단일 (구, 연도)에 대한 예측 수행.
@@ -85,39 +419,105 @@ def predict_for(gu: str, year: int) -> Dict[str, Any]:
         "구": "강남구",
         "연도": 2023,
         "y_pred": 12.34,
-        "y_true": 10.0  # 실제값이 있을 경우
+        "y_true": 10.0,  # 실제값이 있을 경우
+        "model_version": "20261018-010203-ab12cd34",
     }
     """
-    if _model is None:
+    snapshot = _current()
+    if snapshot.model is None:
         raise RuntimeError(
             "lonely_death_model.pkl 을 찾을 수 없습니다. "
             "먼저 'python -m pybo.ml.train_lonely_death' 를 실행해 주세요."
         )
 
-    # 해당 (구, 연도) 행 선택
-    row = _df_features[(_df_features["구"] == gu) & (_df_features["연도"] == year)]
-
-    if row.empty:
-        raise ValueError(f"데이터에 존재하지 않는 (구, 연도) 조합입니다: ({gu}, {year})")
-
-    X = row[FINAL_FEATURES]
+    # 해당 (구, 연도) 행 선택 (없으면 ValueError)
+    i = snapshot.store.row_of(gu, year)
     y_true = None
-    if TARGET_COL in row.columns:
-        # 하나의 행만 있다고 가정
-        y_true = float(row[TARGET_COL].iloc[0])
+    if snapshot.store.targets is not None:
+        y_true = float(snapshot.store.targets[i])
 
-    # 모델 예측
-    y_pred_arr = _model.predict(X)
-    # XGBoost 출력은 numpy 배열이므로 float로 형변환
-    y_pred = float(np.asarray(y_pred_arr)[0])
+    # 로드 시점에 한 번에 계산해 둔 예측값 사용 (요청 경로에서 추론 없음)
+    y_pred = float(snapshot.predictions[i])
 
     return {
         "구": gu,
         "연도": int(year),
         "y_pred": y_pred,
         "y_true": y_true,
+        "model_version": snapshot.model_version,
     }
-    # ==========================================
+
+
+@_observed("ml.predict_many")
+def predict_many(pairs: Sequence[Tuple[str, int]]) -> List[Optional[Dict[str, Any]]]:
+    """
+    여러 (구, 연도)의 predict_for 결과를 한 번에 반환.
+    행 번호 조회와 예측값 조회를 배열 연산 한 번으로 처리하고,
+    데이터에 없는 조합은 None.
+    """
+    snapshot = _current()
+    if snapshot.model is None:
+        raise RuntimeError(
+            "lonely_death_model.pkl 을 찾을 수 없습니다. "
+            "먼저 'python -m pybo.ml.train_lonely_death' 를 실행해 주세요."
+        )
+
+    gus = [gu for gu, _ in pairs]
+    years = [int(year) for _, year in pairs]
+    rows = snapshot.store.rows_of(gus, years)
+    found = rows >= 0
+
+    # 저장소가 비어 있으면 predictions 는 None (이때는 found 도 전부 False)
+    y_pred = np.zeros(len(rows))
+    if snapshot.predictions is not None and found.any():
+        y_pred[found] = snapshot.predictions[rows[found]]
+    y_true = None
+    if snapshot.store.targets is not None:
+        y_true = np.zeros(len(rows))
+        if found.any():
+            y_true[found] = snapshot.store.targets[rows[found]]
+
+    results: List[Optional[Dict[str, Any]]] = []
+    for k, ok in enumerate(found.tolist()):
+        if not ok:
+            results.append(None)
+            continue
+        results.append({
+            "구": gus[k],
+            "연도": years[k],
+            "y_pred": float(y_pred[k]),
+            "y_true": None if y_true is None else float(y_true[k]),
+            "model_version": snapshot.model_version,
+        })
+    return results
+
+
+def all_predictions() -> List[Dict[str, Any]]:
+    """
+    모든 (구, 연도)에 대한 predict_for 결과를 한 번에 반환.
+    DB 백필 / 일괄 조회용.
+    """
+    snapshot = _current()
+    if snapshot.model is None:
+        raise RuntimeError(
+            "lonely_death_model.pkl 을 찾을 수 없습니다. "
+            "먼저 'python -m pybo.ml.train_lonely_death' 를 실행해 주세요."
+        )
+
+    targets = snapshot.store.targets
+    results = []
+    for (gu, year), i in snapshot.store.index.items():
+        results.append({
+            "구": gu,
+            "연도": year,
+            "y_pred": float(snapshot.predictions[i]),
+            "y_true": None if targets is None else float(targets[i]),
+            "model_version": snapshot.model_version,
+        })
+    return results
+
+
+# ==========================================
 # v1.x: 미래(2026~2075) 장기 예측 조회용 함수들
 #  - Flask 뷰에서 이 함수만 사용해서
 #    구 하나의 전체 예측 곡선을 가져올 수 있다.
@@ -134,22 +534,21 @@ def get_future_curve_for_gu(gu: str):
         ...
     ]
     """
-    if _future_df is None:
+    return future_store().records(gu)
+
+
+def future_store() -> FutureStore:
+    """
+    미래 예측 저장소. CSV 가 없으면 RuntimeError.
+    """
+    store = _load_future_store()
+    if store is None:
         raise RuntimeError(
-            "미래 예측 CSV(_future_df)가 로드되지 않았습니다. "
-            "Jupyter에서 미래 예측 CSV를 생성하고 "
+            "미래 예측 CSV가 로드되지 않았습니다. "
+            "'flask --app belong predict forecast' 로 생성하거나 "
             "FUTURE_PRED_PATH 위치에 파일을 배치하세요."
         )
-
-    df_gu = _future_df[_future_df["구"] == gu].copy()
-    if df_gu.empty:
-        return []
-
-    # 연도 순 정렬 + 명 단위로 반올림한 컬럼 추가
-    df_gu = df_gu.sort_values("연도")
-    df_gu["예측값_명"] = df_gu["예측값"].round().astype(int)
-
-    return df_gu.to_dict(orient="records")
+    return store
 
 
 def future_available_years():
@@ -158,13 +557,46 @@ def future_available_years():
     UI에서 축 범위 확인용으로만 쓰고,
     사용자가 직접 연도를 선택하게 만들 필요는 없음.
     """
-    if _future_df is None:
+    store = _load_future_store()
+    if store is None:
         return []
-    years = (
-        _future_df["연도"]
-        .dropna()
-        .astype(int)
-        .unique()
-        .tolist()
+    return list(store.years)
+
+
+def future_payload(gu: Optional[str] = None) -> Optional[EncodedPayload]:
+    """
+    구 하나(gu) 또는 전체 구(gu=None)의 미래 예측 columnar JSON (미리 직렬화 / 압축된 bytes).
+    없는 구면 None, CSV 가 없으면 RuntimeError (future_store 와 같음).
+    """
+    future_store()
+    return _future_payloads.get(ALL_KEY if gu is None else gu)
+
+
+def future_version() -> str:
+    """
+    현재 로드된 미래 예측 CSV 의 버전 문자열 (mtime). 파일이 없으면 "none".
+    """
+    _load_future_store()
+    return str(_future_signature[0]) if _future_signature else "none"
+
+
+def regenerate_future_store(
+    start_year: int = DEFAULT_START_YEAR,
+    end_year: int = DEFAULT_END_YEAR,
+) -> int:
+    """
+    현재 피처 / 모델로 미래 예측 CSV 를 재귀 예측해서 다시 쓰고 행 수를 반환.
+    (FUTURE_PRED_PATH mtime 이 바뀌므로 다음 조회부터 새 곡선이 보인다)
+    """
+    snapshot = _current()
+    if snapshot.model is None:
+        raise RuntimeError(
+            "lonely_death_model.pkl 을 찾을 수 없습니다. "
+            "먼저 'python -m pybo.ml.train_lonely_death' 를 실행해 주세요."
+        )
+
+    df = recursive_forecast(
+        snapshot.df_features, snapshot.model, start_year, end_year, snapshot.store.columns
     )
-    return sorted(years)
+    write_future_csv(df, FUTURE_PRED_PATH)
+    return len(df)
@@ -0,0 +1,120 @@
+"""
+pybo.ml.preload
+
+- preforking 서버(gunicorn --preload 등)용 copy-on-write 친화 preload
+- master 에서 피처 행렬 / 미래 예측 저장소 / 모델 / 사전 계산 예측값을 한 번 만들고
+  gc.freeze() 로 고정한 뒤 fork → 워커들이 같은 메모리 페이지를 공유
+    - 데이터는 읽기 전용 NumPy 버퍼라 요청 경로에서 refcount 를 건드리지 않음
+    - gc.freeze() 로 GC 가 공유 객체 헤더에 쓰지 않게 함
+- 워커별 고유 메모리(USS) 비교 리포트
+
+사용법:
+    ML_EAGER_LOAD = True (config.py) 후
+    gunicorn --preload -w 4 "belong:create_app()"
+
+    python -m belong.ml.preload 4   # lazy / preload 모드 워커별 USS 비교
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import os
+import sys
+from typing import Dict, List, Optional
+
+from . import loader
+
+
+def preload() -> None:
+    """
+    ML 데이터/모델을 모두 로드하고 지금까지 만든 객체를 GC 대상에서 제외.
+    fork 직전(master)에 호출한다.
+    """
+    loader.warmup()
+    gc.collect()
+    gc.freeze()
+
+
+def memory_usage(pid: Optional[int] = None) -> Optional[Dict[str, int]]:
+    """
+    /proc/<pid>/smaps_rollup 기준 메모리 사용량 (kB).
+    uss = 이 프로세스만 쓰는 페이지 (Private_Clean + Private_Dirty).
+    Linux 가 아니면 None.
+    """
+    path = f"/proc/{pid or 'self'}/smaps_rollup"
+    try:
+        with open(path) as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+
+    fields = {}
+    for line in lines[1:]:
+        key, _, rest = line.partition(":")
+        fields[key] = int(rest.split()[0])
+
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "uss": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def _serve_all() -> None:
+    """워커가 하는 일 흉내: 모든 (구, 연도) 예측 + 모든 구 미래 곡선 조회"""
+    for gu in loader.available_regions():
+        for year in loader.available_years():
+            loader.predict_for(gu, year)
+        try:
+            loader.get_future_curve_for_gu(gu)
+        except RuntimeError:
+            pass
+
+
+def _fork_workers(n_workers: int, load_in_worker: bool) -> List[Dict[str, int]]:
+    reports = []
+    children = []
+    for _ in range(n_workers):
+        r, w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(r)
+            if load_in_worker:
+                loader.warmup()
+            _serve_all()
+            os.write(w, json.dumps(memory_usage()).encode())
+            os.close(w)
+            os._exit(0)
+        os.close(w)
+        children.append((pid, r))
+
+    for pid, r in children:
+        with os.fdopen(r) as f:
+            reports.append(json.loads(f.read()))
+        os.waitpid(pid, 0)
+    return reports
+
+
+def compare(n_workers: int = 4) -> Dict[str, List[Dict[str, int]]]:
+    """
+    같은 프로세스에서 두 모드를 차례로 fork 해서 워커별 메모리를 비교.
+    - lazy    : 워커마다 직접 로드
+    - preload : master 에서 preload() 후 fork
+    (lazy 를 먼저 돌려야 master 가 아직 로드 전인 상태에서 fork 된다)
+    """
+    if memory_usage() is None:
+        raise RuntimeError("/proc/self/smaps_rollup 이 필요합니다 (Linux 전용).")
+
+    lazy = _fork_workers(n_workers, load_in_worker=True)
+    preload()
+    preloaded = _fork_workers(n_workers, load_in_worker=False)
+    return {"lazy": lazy, "preload": preloaded}
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    result = compare(n)
+    for mode, reports in result.items():
+        uss = [r["uss"] for r in reports]
+        print(f"{mode:8s} 워커 USS(kB): {uss}  평균 {sum(uss) / len(uss):.0f}")
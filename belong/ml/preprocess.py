@@ -11,22 +11,25 @@ pybo.ml.preprocess
 """
 
 
-from typing import Union
 from pathlib import Path
+from typing import Dict, Iterator
 
+import numpy as np
 import pandas as pd
 
-from . import DATA_PATH, TARGET_COL
-
-PathLike = Union[str, Path]
+from . import DATA_PATH, NUMERIC_FEATURES, REGION_FEATURES, TARGET_COL
+from .columnar import PathLike, read_table
 
 
 def load_raw_data(path: PathLike = DATA_PATH) -> pd.DataFrame:
     """
     원본 CSV(Dataset_ML.csv)를 읽어서 DataFrame으로 반환.
+    (최신 바이너리 사본이 있으면 CSV 파싱 대신 mmap 으로 읽는다 → columnar 모듈.
+     파싱 비용만 줄어든다: 피처 계산에서 새 배열을 만들므로 워커 간 공유는 preload 로)
+    (파일 전체를 float64 로 올리므로 대용량 패널은 iter_raw_chunks / iter_feature_chunks)
     """
     path = Path(path)
-    df = pd.read_csv(path)
+    df = read_table(path)
 
     # 연도는 int(또는 float)로 맞춰두는 편이 안전함
     df["연도"] = pd.to_numeric(df["연도"], errors="coerce").astype("Int64")
@@ -34,44 +37,183 @@ def load_raw_data(path: PathLike = DATA_PATH) -> pd.DataFrame:
     return df
 
 
-def add_engineered_features(df: pd.DataFrame) -> pd.DataFrame:
+# 기본 lag / 이동평균 창 (v0.4: lag_1, lag_2, roll_3)
+DEFAULT_LAGS = (1, 2)
+DEFAULT_WINDOWS = (3,)
+
+
+def _group_layout(df: pd.DataFrame):
+    """
+    (구, 연도) 정렬 순서와 정렬 후 그룹 안에서의 위치를 계산.
+
+    - order    : 정렬 순서 (sort_values(["구", "연도"]) 와 같은 안정 정렬,
+                 결측 연도는 그룹 끝, 결측 구는 맨 뒤)
+    - codes    : 정렬 후 구 코드 (결측 구는 -1)
+    - position : 정렬 후 각 행이 자기 그룹에서 몇 번째인지 (0부터)
+    """
+    codes, _ = pd.factorize(df["구"], sort=True)
+    codes = np.where(codes < 0, np.iinfo(np.int64).max, codes)
+    years = pd.to_numeric(df["연도"], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    years = np.where(np.isnan(years), np.inf, years)
+
+    order = np.lexsort((years, codes))
+    codes = codes[order]
+
+    n = len(codes)
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if n else np.empty(0, np.int64)
+    group_start = np.repeat(starts, np.diff(np.r_[starts, n]))
+    position = np.arange(n) - group_start
+
+    codes = np.where(codes == np.iinfo(np.int64).max, -1, codes)
+    return order, codes, position
+
+
+def _shift(values: np.ndarray, position: np.ndarray, k: int) -> np.ndarray:
+    """그룹 경계를 넘지 않는 k칸 shift (그룹 앞쪽 k개는 NaN)"""
+    out = np.full(len(values), np.nan)
+    if k < len(values):
+        out[k:] = values[:len(values) - k]
+    out[position < k] = np.nan
+    return out
+
+
+def compute_lag_features(
+    target: np.ndarray,
+    codes: np.ndarray,
+    position: np.ndarray,
+    lags=DEFAULT_LAGS,
+    windows=DEFAULT_WINDOWS,
+) -> dict:
+    """
+    (구, 연도)로 정렬된 타깃 배열에서 lag_k / roll_w 를 한 번에 계산.
+
+    - lag_k  : k년 전 값
+    - roll_w : 최근 w년(올해 포함) 평균, 하나라도 비면 NaN (rolling(w).mean() 과 동일)
+    """
+    target = np.asarray(target, dtype=np.float64)
+    target = np.where(codes < 0, np.nan, target)  # 구가 없는 행은 groupby 에서 빠짐
+
+    shifts = {0: target}
+    for k in set(lags) | set(range(1, max(windows, default=1))):
+        shifts[k] = _shift(target, position, k)
+
+    features = {f"lag_{k}": shifts[k] for k in lags}
+    for w in windows:
+        # 오래된 값부터 더해서 pandas rolling 과 같은 순서로 합산
+        total = shifts[w - 1].copy()
+        for j in range(w - 2, -1, -1):
+            total += shifts[j]
+        features[f"roll_{w}"] = total / w
+    return features
+
+
+def add_engineered_features(
+    df: pd.DataFrame,
+    lags=DEFAULT_LAGS,
+    windows=DEFAULT_WINDOWS,
+) -> pd.DataFrame:
     """
     v0.4 노트북에서 했던 피처 엔지니어링 적용:
 
     - 구, 연도 기준 정렬
-    - lag_1, lag_2 : 전년도 / 재작년 고독사 수
-    - roll_3       : 3년 이동평균
+    - lag_1, lag_2 : 전년도 / 재작년 고독사 수   (lags 로 변경 가능)
+    - roll_3       : 3년 이동평균               (windows 로 변경 가능)
     - 인구x노령화   : 총인구 × 노령화지수
     - 노인비x저소득 : 65세 이상 × 저소득노인_80이상비율
-    """
-    df = df.copy()
 
-    # 정렬
-    df = df.sort_values(["구", "연도"])
+    groupby / apply 없이, 정렬된 NumPy 배열과 그룹 경계만으로 한 번에 계산하고
+    lag/roll 이 빈 앞부분 연도 행을 뺀 뒤 전체 프레임을 한 번만 복사한다.
+    """
+    order, codes, position = _group_layout(df)
+    target = df[TARGET_COL].to_numpy(dtype=np.float64, na_value=np.nan)[order]
+    features = compute_lag_features(target, codes, position, lags, windows)
 
-    # 그룹별로 타깃 기준 lag 생성
-    df["lag_1"] = df.groupby("구")[TARGET_COL].shift(1)
-    df["lag_2"] = df.groupby("구")[TARGET_COL].shift(2)
+    # lag/roll 계산 때문에 앞부분 연도에 NaN이 생김 → 해당 행 제거
+    keep = np.ones(len(order), dtype=bool)
+    for values in features.values():
+        keep &= ~np.isnan(values)
 
-    # 3년 이동평균
-    roll = df.groupby("구")[TARGET_COL].apply(lambda x: x.rolling(3).mean())
-    # groupby 인덱스 정리
-    roll = roll.reset_index(level=0, drop=True)
-    df["roll_3"] = roll
+    out = df.take(order[keep]).reset_index(drop=True)
+    for name, values in features.items():
+        out[name] = values[keep]
 
     # 파생 피처
     # 인구x노령화
-    if "총인구" in df.columns and "노령화지수" in df.columns:
-        df["인구x노령화"] = df["총인구"] * df["노령화지수"]
+    if "총인구" in out.columns and "노령화지수" in out.columns:
+        out["인구x노령화"] = out["총인구"] * out["노령화지수"]
 
     # 노인비x저소득
-    if "65세 이상" in df.columns and "저소득노인_80이상비율" in df.columns:
-        df["노인비x저소득"] = df["65세 이상"] * df["저소득노인_80이상비율"]
+    if "65세 이상" in out.columns and "저소득노인_80이상비율" in out.columns:
+        out["노인비x저소득"] = out["65세 이상"] * out["저소득노인_80이상비율"]
 
-    # lag/roll 계산 때문에 앞부분 연도에 NaN이 생김 → 해당 행 제거
-    df = df.dropna(subset=["lag_1", "lag_2", "roll_3"]).reset_index(drop=True)
+    return out
+
+
+def history_depth(lags=DEFAULT_LAGS, windows=DEFAULT_WINDOWS) -> int:
+    """새 행의 lag/roll 을 계산하는 데 필요한 그룹별 과거 행 수"""
+    return max(max(lags, default=0), max(windows, default=1) - 1)
+
+
+def tail_rows(df: pd.DataFrame, depth: int = None) -> pd.DataFrame:
+    """
+    원본 행 중 각 구의 (연도 순) 마지막 depth 개만 남긴 작은 DataFrame.
+    다음 연도 행이 들어왔을 때 lag/roll 을 이어서 계산하는 데 쓴다.
+    """
+    if depth is None:
+        depth = history_depth()
+    order, codes, position = _group_layout(df)
+
+    # 그룹 끝에서부터의 위치 = 그룹 크기 - 1 - position
+    n = len(codes)
+    starts = np.flatnonzero(position == 0)
+    sizes = np.diff(np.r_[starts, n])
+    group_size = np.repeat(sizes, sizes)
+    keep = (codes >= 0) & (group_size - 1 - position < depth)
+    return df.take(order[keep]).reset_index(drop=True)
 
-    return df
+
+def engineer_new_rows(
+    tail: pd.DataFrame,
+    new_raw: pd.DataFrame,
+    lags=DEFAULT_LAGS,
+    windows=DEFAULT_WINDOWS,
+) -> pd.DataFrame:
+    """
+    새로 들어온 (구, 연도) 원본 행들의 피처만 계산.
+    tail(각 구의 마지막 행들, tail_rows 결과) 뒤에 이어 붙여 계산하므로
+    전체 이력을 다시 계산한 결과와 같다.
+
+    새 행의 연도는 그 구의 기존 마지막 연도보다 커야 한다
+    (중간 연도 보정 / 덮어쓰기는 전체 재계산으로 처리).
+    """
+    new_raw = new_raw.copy()
+    new_raw["연도"] = pd.to_numeric(new_raw["연도"], errors="coerce").astype("Int64")
+
+    # 구별 기존 마지막 연도 (tail 에 없는 구는 -inf)
+    tail_years = pd.to_numeric(tail["연도"], errors="coerce").to_numpy(
+        dtype=np.float64, na_value=np.nan
+    )
+    last_year = pd.Series(tail_years).groupby(tail["구"].to_numpy(dtype=object)).max()
+    prev = (
+        pd.Series(new_raw["구"].to_numpy(dtype=object))
+        .map(last_year)
+        .to_numpy(dtype=np.float64, na_value=-np.inf)
+    )
+    years = new_raw["연도"].to_numpy(dtype=np.float64, na_value=np.nan)
+    bad = np.isnan(years) | (years <= np.nan_to_num(prev, nan=-np.inf))
+    if bad.any():
+        i = int(np.argmax(bad))
+        gu, year = new_raw["구"].iloc[i], new_raw["연도"].iloc[i]
+        raise ValueError(
+            f"증분 반영은 각 구의 마지막 연도 이후 행만 가능합니다: ({gu}, {year})"
+        )
+
+    mini = pd.concat(
+        [tail.assign(_new=False), new_raw.assign(_new=True)], ignore_index=True
+    )
+    features = add_engineered_features(mini, lags, windows)
+    features = features[features["_new"].to_numpy(dtype=bool)]
+    return features.drop(columns="_new").reset_index(drop=True)
 
 
 def build_feature_dataframe(path: PathLike = DATA_PATH) -> pd.DataFrame:
@@ -82,3 +224,104 @@ def build_feature_dataframe(path: PathLike = DATA_PATH) -> pd.DataFrame:
     df = load_raw_data(path)
     df = add_engineered_features(df)
     return df
+
+
+# ==========================================
+# 대용량(전국 시군구) 패널용 스트리밍 ingest
+#  - 필요한 컬럼만, 컴팩트 dtype 으로 chunk 단위 로드
+#  - 구별 마지막 행(tail)을 다음 chunk 로 넘겨 lag/roll 을 이어서 계산
+#  - 서비스(loader)는 예측값 재현을 위해 load_raw_data 의 float64 경로를 그대로 쓴다
+# ==========================================
+
+DEFAULT_CHUNKSIZE = 100_000
+
+# 파생 피처(인구x노령화, 노인비x저소득) 계산에 필요한 원본 컬럼
+DERIVED_INPUTS = ["총인구", "노령화지수", "65세 이상", "저소득노인_80이상비율"]
+
+
+def stream_schema(columns) -> Dict[str, str]:
+    """
+    CSV 헤더 중 학습에 필요한 컬럼만 골라 컴팩트 dtype 을 지정.
+
+    - 구           : category
+    - 연도         : Int16 (nullable)
+    - 원-핫 구 컬럼 : int8
+    - 타깃 / 수치   : float32
+    """
+    numeric = [c for c in NUMERIC_FEATURES if c not in ("연도", "lag_1")]
+    wanted = {"구": "category", "연도": "Int16", TARGET_COL: "float32"}
+    wanted.update({c: "float32" for c in numeric + DERIVED_INPUTS})
+    wanted.update({c: "int8" for c in REGION_FEATURES})
+    return {c: wanted[c] for c in columns if c in wanted}
+
+
+def iter_raw_chunks(
+    path: PathLike = DATA_PATH, chunksize: int = DEFAULT_CHUNKSIZE
+) -> Iterator[pd.DataFrame]:
+    """
+    load_raw_data 의 스트리밍 버전.
+    stream_schema 컬럼만 컴팩트 dtype 으로 chunksize 행씩 읽는다.
+    """
+    schema = stream_schema(pd.read_csv(path, nrows=0).columns)
+    # dtype= 으로 파서에 넘기는 것보다 기본 파싱 후 astype 이 빠르다 (float32 / category 변환)
+    for chunk in pd.read_csv(path, usecols=list(schema), chunksize=chunksize):
+        yield chunk.astype(schema)
+
+
+def _compact(df: pd.DataFrame) -> pd.DataFrame:
+    """피처 chunk 를 컴팩트 dtype 으로 (float64 → float32, 연도 → Int16, 구 → category)"""
+    casts = {c: "float32" for c in df.columns if df[c].dtype == np.float64}
+    casts["연도"] = "Int16"
+    casts["구"] = "category"
+    return df.astype(casts)
+
+
+def iter_feature_chunks(
+    path: PathLike = DATA_PATH,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    lags=DEFAULT_LAGS,
+    windows=DEFAULT_WINDOWS,
+) -> Iterator[pd.DataFrame]:
+    """
+    CSV 를 chunk 단위로 읽으면서 피처 DataFrame 을 chunk 별로 yield.
+    메모리에는 chunk 하나 + 구별 tail(history_depth 행)만 유지된다.
+
+    각 구의 행은 파일 안에서 연도 순으로 나와야 한다
+    (연도 순 / (구, 연도) 순으로 정렬된 파일). 아니면 ValueError.
+    """
+    depth = history_depth(lags, windows)
+
+    tail = None
+    for chunk in iter_raw_chunks(path, chunksize):
+        if tail is None:
+            tail = chunk.iloc[:0]
+        # chunk 에 나온 구의 tail 만 이어 붙여 계산 (나머지 구 tail 은 그대로 유지)
+        touched = tail["구"].isin(chunk["구"].unique()).to_numpy()
+        active = tail[touched]
+        features = engineer_new_rows(active, chunk, lags, windows)
+        tail = pd.concat(
+            [tail[~touched], tail_rows(pd.concat([active, chunk], ignore_index=True), depth)],
+            ignore_index=True,
+        )
+        if len(features):
+            yield _compact(features)
+
+
+def build_feature_dataframe_streaming(
+    path: PathLike = DATA_PATH,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    lags=DEFAULT_LAGS,
+    windows=DEFAULT_WINDOWS,
+) -> pd.DataFrame:
+    """
+    iter_feature_chunks 결과를 컴팩트 dtype 그대로 하나로 합친다.
+    (chunk 마다 다른 구 category 는 union 해서 category 로 유지)
+    """
+    chunks = list(iter_feature_chunks(path, chunksize, lags, windows))
+    if not chunks:
+        return pd.DataFrame()
+
+    gu = pd.api.types.union_categoricals([c["구"] for c in chunks], sort_categories=True)
+    out = pd.concat([c.drop(columns="구") for c in chunks], ignore_index=True)
+    out.insert(0, "구", gu)
+    return out
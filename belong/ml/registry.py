@@ -0,0 +1,219 @@
+"""
+pybo.ml.registry
+
+- 학습 산출물(pkl / 컴파일된 npz)을 버전 디렉터리로 보관하는 디스크 모델 레지스트리
+    models/
+      20261018-010203-ab12cd34/
+        lonely_death_model.pkl
+        lonely_death_model.npz      (있으면)
+        manifest.json               (버전, 생성 시각, 파일별 sha256 / 크기, 지표)
+      CURRENT                       (활성 버전 이름 한 줄)
+- publish : 임시 디렉터리에 복사 + 체크섬 기록 후 rename (반쯤 쓰인 버전이 보이지 않음)
+- activate: 체크섬 검사 후 CURRENT 를 os.replace 로 교체
+  → loader 가 CURRENT 의 mtime 변화를 보고 재시작 없이 새 모델로 교체
+- 레지스트리가 비어 있으면 예전처럼 MODEL_PATH / FAST_MODEL_PATH 를 그대로 사용
+  (버전 이름은 pkl 체크섬으로 만든 "file-xxxxxxxxxxxx")
+
+사용법:
+    python -m belong.ml.registry list
+    python -m belong.ml.registry publish            # 현재 MODEL_PATH 를 새 버전으로 등록 + 활성화
+    python -m belong.ml.registry activate <version> # 롤백 / 전환
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from . import FAST_MODEL_PATH, MODEL_PATH, MODEL_REGISTRY_DIR
+from .columnar import PathLike
+
+CURRENT_FILE = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+
+
+class ModelArtifact(NamedTuple):
+    """
+    로드할 모델 파일 위치와 버전 이름.
+    fast_path 는 컴파일된 예측기 (없을 수 있음).
+    """
+    version: str
+    model_path: Path
+    fast_path: Path
+
+
+def file_sha256(path: PathLike) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _mtime(path: PathLike) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def signature(root: PathLike = MODEL_REGISTRY_DIR) -> Tuple[Optional[int], ...]:
+    """
+    모델이 바뀌었는지 판단할 mtime 묶음 (요청마다 stat 몇 번).
+    레지스트리를 쓰면 CURRENT, 아니면 MODEL_PATH / FAST_MODEL_PATH.
+    """
+    current = _mtime(Path(root) / CURRENT_FILE)
+    if current is not None:
+        return (current,)
+    return _mtime(MODEL_PATH), _mtime(FAST_MODEL_PATH)
+
+
+def current_version(root: PathLike = MODEL_REGISTRY_DIR) -> Optional[str]:
+    try:
+        return (Path(root) / CURRENT_FILE).read_text(encoding="utf-8").strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def read_manifest(version: str, root: PathLike = MODEL_REGISTRY_DIR) -> Dict[str, Any]:
+    path = Path(root) / version / MANIFEST_FILE
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise ValueError(f"등록되지 않은 모델 버전입니다: {version}") from None
+
+
+def list_versions(root: PathLike = MODEL_REGISTRY_DIR) -> List[Dict[str, Any]]:
+    """등록된 버전들의 manifest (오래된 순)"""
+    root = Path(root)
+    if not root.exists():
+        return []
+    manifests = []
+    for path in sorted(root.glob(f"*/{MANIFEST_FILE}")):
+        with open(path, encoding="utf-8") as f:
+            manifests.append(json.load(f))
+    return manifests
+
+
+def verify(version: str, root: PathLike = MODEL_REGISTRY_DIR) -> Dict[str, Any]:
+    """
+    manifest 의 sha256 / 크기와 실제 파일을 비교. 다르면 ValueError.
+    """
+    manifest = read_manifest(version, root)
+    base = Path(root) / version
+    for name, entry in manifest["files"].items():
+        path = base / name
+        if not path.exists() or path.stat().st_size != entry["size"]:
+            raise ValueError(f"모델 파일이 없거나 크기가 다릅니다: {path}")
+        if file_sha256(path) != entry["sha256"]:
+            raise ValueError(f"모델 파일 체크섬이 일치하지 않습니다: {path}")
+    return manifest
+
+
+def publish(
+    model_path: PathLike = MODEL_PATH,
+    fast_path: Optional[PathLike] = FAST_MODEL_PATH,
+    metrics: Optional[Dict[str, Any]] = None,
+    activate_now: bool = True,
+    root: PathLike = MODEL_REGISTRY_DIR,
+) -> str:
+    """
+    pkl (+ 컴파일된 npz) 를 새 버전으로 복사해서 등록하고 버전 이름을 반환.
+    mtime 을 보존해서 복사하므로 npz 의 원본 pkl 스탬프가 그대로 맞는다.
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    model_path = Path(model_path)
+
+    sha = file_sha256(model_path)
+    version = f"{time.strftime('%Y%m%d-%H%M%S')}-{sha[:8]}"
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix=f".{version}.", dir=root))
+    try:
+        sources = [model_path]
+        if fast_path is not None and Path(fast_path).exists():
+            sources.append(Path(fast_path))
+
+        files = {}
+        for src in sources:
+            dst = tmp_dir / src.name
+            shutil.copy2(src, dst)
+            files[src.name] = {"sha256": file_sha256(dst), "size": dst.stat().st_size}
+
+        manifest = {
+            "version": version,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "model_file": model_path.name,
+            "fast_file": sources[1].name if len(sources) > 1 else None,
+            "files": files,
+            "metrics": metrics or {},
+        }
+        with open(tmp_dir / MANIFEST_FILE, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        os.rename(tmp_dir, root / version)  # 같은 이름이 이미 있으면 OSError
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    if activate_now:
+        activate(version, root)
+    return version
+
+
+def activate(version: str, root: PathLike = MODEL_REGISTRY_DIR) -> None:
+    """체크섬을 검사한 뒤 CURRENT 를 원자적으로 교체"""
+    verify(version, root)
+    root = Path(root)
+    fd, tmp = tempfile.mkstemp(prefix=f".{CURRENT_FILE}.", dir=root)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(version + "\n")
+    os.replace(tmp, root / CURRENT_FILE)
+
+
+def resolve(root: PathLike = MODEL_REGISTRY_DIR) -> Optional[ModelArtifact]:
+    """
+    지금 로드해야 할 모델 파일과 버전 이름.
+    레지스트리 활성 버전이 있으면 체크섬을 검사해서 반환,
+    없으면 MODEL_PATH 체크섬 기반 버전, pkl 도 없으면 None.
+    """
+    version = current_version(root)
+    if version is not None:
+        manifest = verify(version, root)
+        base = Path(root) / version
+        fast_file = manifest.get("fast_file") or FAST_MODEL_PATH.name
+        return ModelArtifact(version, base / manifest["model_file"], base / fast_file)
+
+    if not MODEL_PATH.exists():
+        if FAST_MODEL_PATH.exists():
+            return ModelArtifact(
+                f"file-{file_sha256(FAST_MODEL_PATH)[:12]}", MODEL_PATH, FAST_MODEL_PATH
+            )
+        return None
+    return ModelArtifact(f"file-{file_sha256(MODEL_PATH)[:12]}", MODEL_PATH, FAST_MODEL_PATH)
+
+
+if __name__ == "__main__":
+    import sys
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    if command == "list":
+        active = current_version()
+        for m in list_versions():
+            mark = "*" if m["version"] == active else " "
+            print(f"{mark} {m['version']}  {m['created_at']}  {', '.join(m['files'])}")
+    elif command == "publish":
+        print(f"{publish()} 등록 / 활성화 완료")
+    elif command == "activate" and len(sys.argv) > 2:
+        activate(sys.argv[2])
+        print(f"{sys.argv[2]} 활성화 완료")
+    else:
+        print("사용법: python -m belong.ml.registry [list | publish | activate <version>]")
+        sys.exit(1)
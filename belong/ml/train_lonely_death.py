@@ -5,16 +5,36 @@ pybo.ml.train_lonely_death
 - 피처 엔지니어링 → 학습 데이터 구성
 - XGBoost Regressor + StandardScaler + ColumnTransformer 파이프라인 학습
 - lonely_death_model.pkl 로 저장
-"""
-"""
+- 같은 파이프라인을 순수 NumPy 예측기로 컴파일해서
+  lonely_death_model.npz 로 저장 (원본과 일치 검사 포함, fast_predict 모듈)
+- 두 파일을 모델 레지스트리에 새 버전으로 등록 + 활성화 (registry 모듈)
+  → 실행 중인 워커들이 재시작 없이 새 모델로 교체
+- --search 모드: 연도 기준(시간 순) 교차검증 + 프로세스 풀 병렬 하이퍼파라미터 탐색
+    - fold k : 검증 연도 v 이전 연도 전체로 학습, v 한 해로 검증 (expanding window)
+    - 후보별 early stopping 으로 트리 수 결정 → 최적 후보를 전체 데이터로 재학습
+    - 지표 / 소요 시간 리포트를 MODEL_PATH 옆 lonely_death_model_report.json 으로 저장
+
 ...
 - v1.x Flask 서비스에서는 미래 예측 CSV를 사용하므로,
   이 스크립트는 모델 재학습/연구용으로 사용.
+
+사용법:
+    python -m belong.ml.train_lonely_death                      # v0.4 설정 그대로 학습
+    python -m belong.ml.train_lonely_death --search --workers 8 # 탐색 후 최적 모델 저장
 """
 
 from __future__ import annotations
 
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
 import joblib
+import numpy as np
+import pandas as pd
 from sklearn.compose import ColumnTransformer
 from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
@@ -23,62 +43,270 @@ from xgboost import XGBRegressor
 
 from . import (
     DATA_PATH,
+    FAST_MODEL_PATH,
     MODEL_PATH,
+    MODEL_REPORT_PATH,
     TARGET_COL,
     FINAL_FEATURES,
     NUMERIC_FEATURES,
     REGION_FEATURES,
 )
+from . import registry
+from .fast_predict import export_compiled_model
 from .preprocess import build_feature_dataframe
 
+# v0.4 노트북 설정
+DEFAULT_PARAMS = {
+    "n_estimators": 400,
+    "learning_rate": 0.05,
+    "max_depth": 3,
+    "subsample": 0.9,
+    "colsample_bytree": 0.9,
+}
 
-def train_and_save_model() -> None:
-    # 1) 데이터 로드 + 피처 엔지니어링
-    df = build_feature_dataframe(DATA_PATH)
+# --search 탐색 공간 (후보 = 모든 조합, n_estimators 는 early stopping 으로 결정)
+PARAM_GRID = {
+    "learning_rate": [0.03, 0.05, 0.1],
+    "max_depth": [2, 3, 4, 5],
+    "min_child_weight": [1, 3],
+    "subsample": [0.8, 1.0],
+    "colsample_bytree": [0.8, 1.0],
+}
 
-    # 2) X, y 분리
-    X = df[FINAL_FEATURES]
-    y = df[TARGET_COL]
+# 탐색 시 트리 수 상한 / early stopping 기준 라운드
+MAX_ESTIMATORS = 2000
+EARLY_STOPPING_ROUNDS = 50
+
+# 검증 연도 수 (마지막 n 개 연도를 하나씩 검증 fold 로 사용)
+DEFAULT_N_FOLDS = 3
+
+Fold = Tuple[np.ndarray, np.ndarray]
 
-    # 3) 학습/검증 나누기
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42
-    )
 
-    # 4) 전처리 파이프라인 (수치형 스케일링 + 구 원-핫 패스스루)
+def build_pipeline(**params) -> Pipeline:
+    """전처리(수치형 스케일링 + 구 원-핫 패스스루) + XGBRegressor 파이프라인"""
     preprocess = ColumnTransformer(
         transformers=[
             ("num", StandardScaler(), NUMERIC_FEATURES),
             ("cat", "passthrough", REGION_FEATURES),
         ]
     )
-
-    # 5) 모델 정의 (v0.4 노트북 설정 반영)
     model = XGBRegressor(
-        n_estimators=400,
-        learning_rate=0.05,
-        max_depth=3,
-        subsample=0.9,
-        colsample_bytree=0.9,
         random_state=42,
         objective="reg:squarederror",
         tree_method="hist",
+        **params,
     )
-
-    pipeline = Pipeline(
+    return Pipeline(
         steps=[
             ("preprocess", preprocess),
             ("model", model),
         ]
     )
 
-    # 6) 학습
-    pipeline.fit(X_train, y_train)
 
-    # 7) 학습된 파이프라인 저장
+def _save(
+    pipeline: Pipeline, X: pd.DataFrame, metrics: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    학습된 파이프라인 저장 + 서비스용 경량 예측기로 컴파일 (전체 데이터로 일치 검사)
+    + 레지스트리에 새 버전으로 등록 / 활성화. 버전 이름을 반환.
+    """
     MODEL_PATH.parent.mkdir(parents=True, exist_ok=True)
     joblib.dump(pipeline, MODEL_PATH)
+    export_compiled_model(pipeline, X)
+    return registry.publish(MODEL_PATH, FAST_MODEL_PATH, metrics=metrics)
+
+
+def train_and_save_model() -> None:
+    # 1) 데이터 로드 + 피처 엔지니어링
+    df = build_feature_dataframe(DATA_PATH)
+
+    # 2) X, y 분리
+    X = df[FINAL_FEATURES]
+    y = df[TARGET_COL]
+
+    # 3) 학습/검증 나누기
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42
+    )
+
+    # 4) 파이프라인 (v0.4 노트북 설정 반영)
+    pipeline = build_pipeline(**DEFAULT_PARAMS)
+
+    # 5) 학습
+    pipeline.fit(X_train, y_train)
+
+    # 6) 저장 + 컴파일 + 레지스트리 등록
+    _save(pipeline, X)
+
+
+# ==========================================
+# 연도 기준 교차검증 + 병렬 하이퍼파라미터 탐색
+# ==========================================
+
+def year_folds(years: Sequence[int], n_folds: int = DEFAULT_N_FOLDS) -> List[Fold]:
+    """
+    시간 순 fold 목록 [(train 행 번호, valid 행 번호), ...].
+    마지막 n_folds 개 연도 v 각각에 대해 train = 연도 < v, valid = 연도 == v.
+    """
+    years = np.asarray(years, dtype=np.int64)
+    distinct = np.unique(years)
+    if len(distinct) <= n_folds:
+        raise ValueError(
+            f"연도가 {len(distinct)}개뿐이라 {n_folds}개 fold 를 만들 수 없습니다."
+        )
+    return [
+        (np.flatnonzero(years < v), np.flatnonzero(years == v))
+        for v in distinct[-n_folds:]
+    ]
+
+
+def param_candidates(grid: Dict[str, Sequence[Any]] = PARAM_GRID) -> List[Dict[str, Any]]:
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+
+
+# 워커 프로세스 전역 (initializer 로 한 번만 전달 → 후보마다 데이터를 pickle 하지 않음)
+_worker_data: Dict[str, Any] = {}
+
+
+def _init_worker(X: pd.DataFrame, y: np.ndarray, folds: List[Fold], n_jobs: int) -> None:
+    _worker_data.update(X=X, y=y, folds=folds, n_jobs=n_jobs)
+
+
+def _evaluate(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    후보 하나를 모든 fold 에서 early stopping 으로 학습/검증.
+    전처리는 fold 의 train 에만 fit 한다 (검증 연도 정보 누수 방지).
+    """
+    X, y, folds = _worker_data["X"], _worker_data["y"], _worker_data["folds"]
+    start = time.perf_counter()
+
+    fold_reports = []
+    for train_idx, valid_idx in folds:
+        pipeline = build_pipeline(
+            n_estimators=MAX_ESTIMATORS,
+            early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+            n_jobs=_worker_data["n_jobs"],
+            **params,
+        )
+        preprocess = pipeline.named_steps["preprocess"]
+        model = pipeline.named_steps["model"]
+
+        X_train = preprocess.fit_transform(X.iloc[train_idx])
+        X_valid = preprocess.transform(X.iloc[valid_idx])
+        y_train, y_valid = y[train_idx], y[valid_idx]
+        model.fit(X_train, y_train, eval_set=[(X_valid, y_valid)], verbose=False)
+
+        err = model.predict(X_valid) - y_valid  # best_iteration 까지의 트리로 예측
+        fold_reports.append({
+            "valid_year": int(X["연도"].iloc[valid_idx[0]]),
+            "n_train": len(train_idx),
+            "n_valid": len(valid_idx),
+            "best_iteration": int(model.best_iteration),
+            "rmse": float(np.sqrt(np.mean(err ** 2))),
+            "mae": float(np.mean(np.abs(err))),
+        })
+
+    return {
+        "params": params,
+        "rmse": float(np.mean([f["rmse"] for f in fold_reports])),
+        "mae": float(np.mean([f["mae"] for f in fold_reports])),
+        "n_estimators": int(np.mean([f["best_iteration"] for f in fold_reports])) + 1,
+        "folds": fold_reports,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def search_and_save_model(
+    workers: Optional[int] = None,
+    n_folds: int = DEFAULT_N_FOLDS,
+    grid: Dict[str, Sequence[Any]] = PARAM_GRID,
+) -> Dict[str, Any]:
+    """
+    연도 기준 CV 로 grid 의 모든 후보를 프로세스 풀에서 병렬 평가하고,
+    평균 RMSE 가 가장 낮은 후보를 전체 데이터로 재학습해서 저장.
+    (트리 수 = fold 별 best_iteration 평균)
+    리포트(dict)를 MODEL_REPORT_PATH 에 JSON 으로 쓰고 반환한다.
+
+    workers : 프로세스 수 (None → CPU 수). 프로세스마다 XGBoost 스레드는 1개.
+    """
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+
+    df = build_feature_dataframe(DATA_PATH)
+    df = df[df["연도"].notna()].reset_index(drop=True)
+    X = df[FINAL_FEATURES]
+    y = df[TARGET_COL].to_numpy(dtype=np.float64)
+    folds = year_folds(df["연도"].to_numpy(dtype=np.int64), n_folds)
+    candidates = param_candidates(grid)
+    loaded = time.perf_counter()
+
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(X, y, folds, 1)
+    ) as pool:
+        futures = [pool.submit(_evaluate, params) for params in candidates]
+        for future in as_completed(futures):
+            results.append(future.result())
+    searched = time.perf_counter()
+
+    results.sort(key=lambda r: r["rmse"])
+    best = results[0]
+
+    pipeline = build_pipeline(n_estimators=best["n_estimators"], **best["params"])
+    pipeline.fit(X, y)
+    version = _save(pipeline, X, metrics={
+        "cv_rmse": best["rmse"],
+        "cv_mae": best["mae"],
+        "valid_years": [f["valid_year"] for f in best["folds"]],
+        "params": {**best["params"], "n_estimators": best["n_estimators"]},
+    })
+    finished = time.perf_counter()
+
+    report = {
+        "model_path": str(MODEL_PATH),
+        "model_version": version,
+        "n_rows": len(df),
+        "valid_years": [f["valid_year"] for f in best["folds"]],
+        "best": best,
+        "candidates": results,
+        "timing": {
+            "workers": workers,
+            "n_candidates": len(candidates),
+            "load_seconds": loaded - started,
+            "search_seconds": searched - loaded,
+            "candidate_seconds_total": sum(r["seconds"] for r in results),
+            "refit_seconds": finished - searched,
+            "total_seconds": finished - started,
+        },
+    }
+    tmp = MODEL_REPORT_PATH.with_name(MODEL_REPORT_PATH.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, MODEL_REPORT_PATH)
+    return report
 
 
 if __name__ == "__main__":
-    train_and_save_model()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="고독사 예측 모델 학습")
+    parser.add_argument("--search", action="store_true", help="연도 CV + 병렬 하이퍼파라미터 탐색")
+    parser.add_argument("--workers", type=int, default=None, help="탐색 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--folds", type=int, default=DEFAULT_N_FOLDS, help="검증 연도 수")
+    args = parser.parse_args()
+
+    if args.search:
+        report = search_and_save_model(workers=args.workers, n_folds=args.folds)
+        best, timing = report["best"], report["timing"]
+        print(f"최적 파라미터: {best['params']} (트리 {best['n_estimators']}개)")
+        print(f"연도 CV RMSE {best['rmse']:.3f} / MAE {best['mae']:.3f} (검증 연도 {report['valid_years']})")
+        print(
+            f"후보 {timing['n_candidates']}개, 워커 {timing['workers']}개, "
+            f"탐색 {timing['search_seconds']:.1f}s / 전체 {timing['total_seconds']:.1f}s"
+        )
+        print(f"{MODEL_PATH}, {MODEL_REPORT_PATH} 저장 완료 (모델 버전 {report['model_version']})")
+    else:
+        train_and_save_model()
@@ -8,14 +8,30 @@ class Question(db.Model):
     content = db.Column(db.Text(), nullable=False)
     create_date = db.Column(db.DateTime(), nullable=False)
 
+    __table_args__ = (
+        # 질문 목록 keyset 페이지네이션 (create_date DESC, id DESC) 범위 스캔용
+        db.Index("ix_question_create_date_id", "create_date", "id"),
+    )
+
 class Answer(db.Model):
     __tablename__ = 'answer'
     id = db.Column(db.Integer, db.Sequence('answer_seq', start=1, increment=1), primary_key=True)
     question_id = db.Column(db.Integer, db.ForeignKey('question.id', ondelete='CASCADE'))
-    question = db.relationship('Question', backref=db.backref('answer_set'))
+    # answer_set 은 기본(lazy select) 리스트 그대로, 작성 순 정렬.
+    # 상세 화면은 question_views.render_detail 에서 한 페이지만 LIMIT 조회,
+    # 여러 질문의 답변이 필요하면 selectinload(Question.answer_set) 로 한 번에 읽는다.
+    question = db.relationship(
+        'Question',
+        backref=db.backref('answer_set', order_by=lambda: [Answer.create_date, Answer.id]),
+    )
     content = db.Column(db.Text(), nullable=False)
     create_date = db.Column(db.DateTime(), nullable=False)
 
+    __table_args__ = (
+        # 질문별 답변 페이지 (question_id, create_date 순) / 답변 수 집계용
+        db.Index("ix_answer_question_id_create_date", "question_id", "create_date"),
+    )
+
 class Users(db.Model):
     __tablename__ = 'users'
     id = db.Column(db.Integer,db.Sequence('users_seq', start=1, increment=1), primary_key=True)
@@ -31,6 +47,7 @@ class LonelyPrediction(db.Model):
     - year : 연도 (예: 2023)
     - predicted_value : ML 모델이 예측한 고독사 인원수
     - actual_value    : 실제 관측값 (있다면 입력, 없으면 NULL)
+    - model_version   : 예측한 모델의 registry 버전 (다르면 캐시 무효 → 재예측)
     """
     # __bind_key__ = 'ml'
     __tablename__ = "lonely_prediction"
@@ -45,6 +62,7 @@ class LonelyPrediction(db.Model):
 
     predicted_value = db.Column(db.Float, nullable=False)
     actual_value = db.Column(db.Float, nullable=True)
+    model_version = db.Column(db.String(40), nullable=True)
 
     created_at = db.Column(db.DateTime(), default=datetime.now)
 
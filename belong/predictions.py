@@ -0,0 +1,462 @@
+"""
+belong.predictions
+
+- LonelyPrediction 테이블 일괄 적재(backfill) / 멱등 upsert 헬퍼
+- 요청 경로에서는 insert_if_absent 로 (gu, year) 유니크 키 경합을 없앤다.
+- lookup 은 DB 조회 앞에 프로세스 로컬 LRU/TTL 캐시를 둔다.
+  (모델/CSV 버전이 바뀌거나 행이 수정되면 무효화,
+   다른 워커에서 수정된 행은 PREDICTION_CACHE_TTL 안에 반영)
+- 캐시 miss 는 predict_and_store 로 micro-batching 실행기(belong.ml.executor)에 넘겨
+  같은 (gu, year) 동시 요청은 계산 하나를 공유하고, 몇 ms 안에 모인 miss 들은
+  predict_many 한 번 + upsert 트랜잭션 하나로 처리한다.
+- 행마다 예측한 모델 버전(model_version)을 기록하고,
+  현재 모델과 버전이 다른 행은 캐시 miss 로 취급해서 다시 예측 / 갱신한다.
+
+DB 방언별 SQL
+- sqlite / postgresql :
+    INSERT ... ON CONFLICT (gu, year) DO UPDATE
+    (insert_if_absent 는 model_version 이 다른 행만 갱신)
+- oracle (config.SQLALCHEMY_DATABASE_URI 의 cx_Oracle) :
+    MERGE INTO lonely_prediction t
+    USING (SELECT :gu AS gu, :year AS year, ... FROM dual) s
+    ON (t.gu = s.gu AND t.year = s.year)
+    WHEN MATCHED THEN UPDATE ...
+    WHEN NOT MATCHED THEN INSERT (id, ...) VALUES (lonely_prediction_seq.NEXTVAL, ...)
+  바인드 파라미터 리스트로 executemany 하면 cx_Oracle 이 array DML 로
+  한 번에 보낸다. Oracle MERGE 도 동시 INSERT 끼리는 ORA-00001 이 날 수 있으므로
+  단건 경로는 IntegrityError 시 한 번 다시 조회한다.
+- 그 외 : 행 단위 조회 후 insert / update (느리지만 동일한 결과)
+
+로컬 벤치마크 (SQLite):
+    DATABASE_URL=sqlite:///bench.db flask predict backfill --create-tables
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from flask import current_app
+from sqlalchemy import event, func, text
+from sqlalchemy.exc import IntegrityError
+
+from . import db
+from .cache import LRUCache
+from .ml.executor import MicroBatcher
+from .ml.loader import data_version, model_version, predict_for, predict_many
+from .models import LonelyPrediction
+
+# executemany 한 번에 보낼 행 수
+DEFAULT_BATCH_SIZE = 500
+
+_ORACLE_MERGE = """
+MERGE INTO lonely_prediction t
+USING (
+    SELECT :gu AS gu, :year AS year,
+           :predicted_value AS predicted_value, :actual_value AS actual_value,
+           :model_version AS model_version
+    FROM dual
+) s
+ON (t.gu = s.gu AND t.year = s.year)
+WHEN MATCHED THEN
+    UPDATE SET t.predicted_value = s.predicted_value,
+               t.actual_value = NVL(s.actual_value, t.actual_value),
+               t.model_version = s.model_version
+    {where}
+WHEN NOT MATCHED THEN
+    INSERT (id, gu, year, predicted_value, actual_value, model_version, created_at)
+    VALUES (lonely_prediction_seq.NEXTVAL, s.gu, s.year,
+            s.predicted_value, s.actual_value, s.model_version, :created_at)
+"""
+
+# insert_if_absent: 같은 모델 버전으로 이미 저장된 행은 건드리지 않음
+_ORACLE_STALE_ONLY = (
+    "WHERE t.model_version IS NULL OR s.model_version IS NULL "
+    "OR t.model_version <> s.model_version"
+)
+
+
+class CachedPrediction(NamedTuple):
+    """
+    캐시에 보관하는 LonelyPrediction 행의 값 복사본.
+    (세션에 묶인 ORM 객체를 요청 간에 공유하지 않기 위함)
+    """
+    gu: str
+    year: int
+    predicted_value: float
+    actual_value: Optional[float]
+    model_version: Optional[str]
+
+    @classmethod
+    def from_row(cls, row: LonelyPrediction) -> "CachedPrediction":
+        return cls(row.gu, row.year, row.predicted_value, row.actual_value, row.model_version)
+
+
+_cache: Optional[LRUCache] = None
+_cache_lock = threading.Lock()
+_cache_version: Optional[str] = None
+
+
+def prediction_cache() -> LRUCache:
+    """
+    (gu, year) → CachedPrediction 캐시.
+    크기 / TTL 은 config 의 PREDICTION_CACHE_SIZE / PREDICTION_CACHE_TTL.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LRUCache(
+                    maxsize=current_app.config.get("PREDICTION_CACHE_SIZE", 1024),
+                    ttl=current_app.config.get("PREDICTION_CACHE_TTL"),
+                )
+    return _cache
+
+
+def invalidate_cache(gu: Optional[str] = None, year: Optional[int] = None) -> None:
+    """
+    (gu, year) 하나 또는 (인자가 없으면) 캐시 전체를 비운다.
+    """
+    if _cache is None:
+        return
+    if gu is None:
+        _cache.clear()
+    else:
+        _cache.invalidate((gu, year))
+
+
+def _fresh_cache() -> LRUCache:
+    """모델 / CSV 가 다시 로드됐으면 캐시를 비우고 반환"""
+    global _cache_version
+    cache = prediction_cache()
+    version = data_version()
+    if version != _cache_version:
+        cache.clear()
+        _cache_version = version
+    return cache
+
+
+@event.listens_for(LonelyPrediction, "after_insert")
+@event.listens_for(LonelyPrediction, "after_update")
+@event.listens_for(LonelyPrediction, "after_delete")
+def _invalidate_row(mapper, connection, target):
+    # ORM 으로 actual_value 등을 수정하면 해당 키만 무효화
+    invalidate_cache(target.gu, target.year)
+
+
+def lookup(gu: str, year: int) -> Optional[CachedPrediction]:
+    """
+    (gu, year) 저장값을 캐시 → DB 순으로 조회.
+    없거나 현재 모델과 다른 버전으로 예측된 행이면 None.
+    (없는 결과는 캐시하지 않는다)
+    """
+    cache = _fresh_cache()
+    key = (gu, year)
+
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    row = LonelyPrediction.query.filter_by(gu=gu, year=year).first()
+    if row is None or row.model_version != model_version():
+        return None
+
+    cached = CachedPrediction.from_row(row)
+    cache.set(key, cached)
+    return cached
+
+
+def lookup_many(pairs: Iterable[Tuple[str, int]]) -> Dict[Tuple[str, int], CachedPrediction]:
+    """
+    여러 (gu, year)의 저장값을 캐시 → DB 순으로 조회.
+    캐시에 없는 키들은 쿼리 한 번(gu IN ... AND year IN ...)으로 가져온다.
+    현재 모델 버전으로 저장된 것만 dict 로 반환.
+    """
+    cache = _fresh_cache()
+    version = model_version()
+    found: Dict[Tuple[str, int], CachedPrediction] = {}
+    missing = set()
+    for key in pairs:
+        cached = cache.get(key)
+        if cached is not None:
+            found[key] = cached
+        else:
+            missing.add(key)
+
+    if missing:
+        gus = {gu for gu, _ in missing}
+        years = {year for _, year in missing}
+        rows = LonelyPrediction.query.filter(
+            LonelyPrediction.gu.in_(gus), LonelyPrediction.year.in_(years)
+        ).all()
+        for row in rows:
+            key = (row.gu, row.year)
+            if key in missing and row.model_version == version:
+                found[key] = CachedPrediction.from_row(row)
+                cache.set(key, found[key])
+
+    return found
+
+
+def clean_float(value: Optional[float]) -> Optional[float]:
+    """NaN 실제값은 NULL 로 저장"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return float(value)
+
+
+def prediction_rows(results: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    loader.predict_for / all_predictions 결과를 테이블 행(dict) 리스트로 변환.
+    """
+    now = datetime.now()
+    return [
+        {
+            "gu": r["구"],
+            "year": int(r["연도"]),
+            "predicted_value": float(r["y_pred"]),
+            "actual_value": clean_float(r.get("y_true")),
+            "model_version": r.get("model_version"),
+            "created_at": now,
+        }
+        for r in results
+    ]
+
+
+def _dialect_name() -> str:
+    return db.session.get_bind().dialect.name
+
+
+def _execute_batch(rows: List[Dict[str, Any]], update: bool) -> int:
+    """
+    한 배치를 방언에 맞는 upsert 로 실행하고 반영된 행 수를 반환.
+    update=False 이면 이미 있는 (gu, year)는 model_version 이 다를 때만 갱신한다.
+    """
+    dialect = _dialect_name()
+    table = LonelyPrediction.__table__
+
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["gu", "year"],
+            set_={
+                "predicted_value": stmt.excluded.predicted_value,
+                "actual_value": func.coalesce(
+                    stmt.excluded.actual_value, table.c.actual_value
+                ),
+                "model_version": stmt.excluded.model_version,
+            },
+            where=None if update else table.c.model_version.is_distinct_from(
+                stmt.excluded.model_version
+            ),
+        )
+        return db.session.execute(stmt, rows).rowcount
+
+    if dialect == "oracle":
+        sql = _ORACLE_MERGE.format(where="" if update else _ORACLE_STALE_ONLY)
+        return db.session.execute(text(sql), rows).rowcount
+
+    # 범용 fallback: 행 단위 조회 후 insert / update
+    count = 0
+    for row in rows:
+        existing = LonelyPrediction.query.filter_by(gu=row["gu"], year=row["year"]).first()
+        if existing is None:
+            db.session.add(LonelyPrediction(**row))
+            count += 1
+        elif update or existing.model_version != row["model_version"]:
+            existing.predicted_value = row["predicted_value"]
+            if row["actual_value"] is not None:
+                existing.actual_value = row["actual_value"]
+            existing.model_version = row["model_version"]
+            count += 1
+    db.session.flush()
+    return count
+
+
+def bulk_upsert(
+    rows: List[Dict[str, Any]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    update: bool = True,
+) -> int:
+    """
+    여러 행을 batch_size 단위 executemany / MERGE 로 한 트랜잭션에 적재.
+    반영된 행 수를 반환한다.
+    """
+    count = 0
+    try:
+        for start in range(0, len(rows), batch_size):
+            count += _execute_batch(rows[start:start + batch_size], update=update)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        # Core 문장은 mapper 이벤트를 타지 않으므로 직접 비운다
+        invalidate_cache()
+    return count
+
+
+def insert_if_absent(result: Dict[str, Any]) -> Tuple[CachedPrediction, bool]:
+    """
+    predict_for 결과 한 건을 멱등하게 저장하고 (행 값, 새로 저장/갱신했는지)를 반환.
+    이전 모델 버전으로 저장된 행은 새 예측값으로 갱신한다.
+
+    같은 (gu, year)를 동시에 저장하려는 요청이 있어도
+    유니크 키 위반 없이 먼저 저장된 행을 그대로 돌려준다.
+    """
+    rows = prediction_rows([result])
+    gu, year = rows[0]["gu"], rows[0]["year"]
+
+    try:
+        created = _execute_batch(rows, update=False) > 0
+        db.session.commit()
+    except IntegrityError:
+        # 범용 fallback / Oracle MERGE 가 동시 INSERT 에서 진 경우
+        db.session.rollback()
+        created = False
+
+    row = CachedPrediction.from_row(
+        LonelyPrediction.query.filter_by(gu=gu, year=year).one()
+    )
+    _fresh_cache().set((gu, year), row)
+    return row, created
+
+
+# ==========================================
+# 캐시 miss 처리: coalescing + micro-batching
+# ==========================================
+
+Key = Tuple[str, int]
+StoreResult = Tuple[CachedPrediction, bool]
+
+
+def _fetch_current(keys: Sequence[Key], version: Optional[str]) -> Dict[Key, CachedPrediction]:
+    """keys 중 현재 모델 버전으로 저장된 행 (쿼리 한 번)"""
+    wanted = set(keys)
+    rows = LonelyPrediction.query.filter(
+        LonelyPrediction.gu.in_({gu for gu, _ in wanted}),
+        LonelyPrediction.year.in_({year for _, year in wanted}),
+    ).all()
+    return {
+        (row.gu, row.year): CachedPrediction.from_row(row)
+        for row in rows
+        if (row.gu, row.year) in wanted and row.model_version == version
+    }
+
+
+def _insert_missing(rows: List[Dict[str, Any]]) -> set:
+    """
+    아직 없는 행들을 저장하고 실제로 저장 / 갱신한 (gu, year) 집합을 반환.
+    한 트랜잭션으로 먼저 시도하고, 유니크 키 경합으로 통째로 rollback 되면
+    (다른 프로세스가 일부 키를 먼저 저장) 행마다 다시 시도한다.
+    """
+    try:
+        for start in range(0, len(rows), DEFAULT_BATCH_SIZE):
+            _execute_batch(rows[start:start + DEFAULT_BATCH_SIZE], update=False)
+        db.session.commit()
+        return {(row["gu"], row["year"]) for row in rows}
+    except IntegrityError:
+        db.session.rollback()
+
+    created = set()
+    for row in rows:
+        try:
+            if _execute_batch([row], update=False) > 0:
+                created.add((row["gu"], row["year"]))
+            db.session.commit()
+        except IntegrityError:
+            # 이 키는 경합에서 졌다 → 먼저 저장된 행을 아래에서 읽는다
+            db.session.rollback()
+    return created
+
+
+def store_predictions(keys: Sequence[Key]) -> List[Union[StoreResult, Exception]]:
+    """
+    여러 (gu, year)를 한 번에 예측 / 저장하고 키 순서대로 (행 값, 새로 저장/갱신했는지)를 반환.
+    데이터에 없는 조합은 그 자리에 ValueError, 저장 후 행을 찾지 못한 키는 RuntimeError.
+    (predict_many 한 번 → 없는 것만 upsert 한 트랜잭션 → 결과 조회 한 번)
+    """
+    results = predict_many(keys)
+    found = [key for key, r in zip(keys, results) if r is not None]
+    # 예측에 실제로 쓴 모델 버전 (그 사이 hot-swap 돼도 행과 같은 버전으로 조회)
+    version = next((r["model_version"] for r in results if r is not None), None)
+
+    before = _fetch_current(found, version) if found else {}
+    rows = prediction_rows(
+        r for key, r in zip(keys, results) if r is not None and key not in before
+    )
+    created = _insert_missing(rows) if rows else set()
+
+    after = _fetch_current(found, version) if rows else before
+    cache = _fresh_cache()
+    out: List[Union[StoreResult, Exception]] = []
+    for key, r in zip(keys, results):
+        if r is None:
+            out.append(ValueError(f"데이터에 존재하지 않는 (구, 연도) 조합입니다: {key}"))
+            continue
+        row = after.get(key)
+        if row is None:
+            # 다른 모델 버전으로 그 사이에 덮어써진 경우 등
+            out.append(RuntimeError(f"저장된 예측 행을 찾을 수 없습니다: {key} ({version})"))
+            continue
+        cache.set(key, row)
+        out.append((row, key in created))
+    return out
+
+
+_executor: Optional[MicroBatcher] = None
+_executor_pid: Optional[int] = None
+_executor_lock = threading.Lock()
+
+
+def prediction_executor() -> Optional[MicroBatcher]:
+    """
+    프로세스별 miss 처리 실행기 (처음 쓸 때 생성, fork 후에는 워커에서 다시 생성).
+    config.PREDICT_EXECUTOR_WORKERS 가 0 이면 None.
+    """
+    global _executor, _executor_pid
+
+    workers = current_app.config.get("PREDICT_EXECUTOR_WORKERS", 0)
+    if not workers:
+        return None
+    if _executor is not None and _executor_pid == os.getpid():
+        return _executor
+
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            app = current_app._get_current_object()
+
+            def run(keys):
+                # 실행기 스레드에는 요청 컨텍스트가 없으므로 앱 컨텍스트(세션 포함)를 따로 연다
+                with app.app_context():
+                    return store_predictions(keys)
+
+            _executor = MicroBatcher(
+                run,
+                max_batch=current_app.config.get("PREDICT_BATCH_SIZE", 64),
+                max_wait=current_app.config.get("PREDICT_BATCH_WAIT_MS", 5) / 1000.0,
+                workers=workers,
+                name="predict",
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def predict_and_store(gu: str, year: int) -> StoreResult:
+    """
+    캐시 miss 한 건: 예측 + 멱등 저장 후 (행 값, 새로 저장/갱신했는지)를 반환.
+    실행기가 켜져 있으면 동시에 들어온 miss 들과 묶어서 처리된다.
+    (같은 키로 계산을 공유한 요청들은 created 까지 같은 결과를 받는다)
+    """
+    executor = prediction_executor()
+    if executor is None:
+        return insert_if_absent(predict_for(gu, year))
+    return executor((gu, int(year)))
@@ -0,0 +1,97 @@
+"""
+belong.response_cache
+
+- 데이터 / 모델이 바뀔 때만 내용이 바뀌는 페이지용 렌더링 결과 캐시
+    - 키 = (endpoint, 구, 데이터/모델 버전, 로그인 여부)
+      → 버전이 바뀌면 키가 달라지므로 따로 비울 필요 없음 (옛 항목은 LRU 로 밀려남)
+    - 값 = (strong ETag, 렌더링된 HTML bytes), 크기는 RESPONSE_CACHE_SIZE 로 제한
+- 응답에는 ETag / Cache-Control 을 붙이고, If-None-Match 가 같으면 304 (본문 없음)
+- 캐시하는 템플릿은 로그인 여부 외에 요청마다 달라지는 내용(flash 메시지, CSRF 토큰 등)을
+  렌더링하지 않아야 한다
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from typing import Callable, Hashable, NamedTuple, Optional
+
+from flask import Response, current_app, g, request
+
+from .cache import LRUCache
+
+
+class CachedPage(NamedTuple):
+    etag: str
+    body: bytes
+
+
+_cache: Optional[LRUCache] = None
+_cache_lock = threading.Lock()
+
+
+def response_cache() -> Optional[LRUCache]:
+    """
+    (키 → CachedPage) 캐시. RESPONSE_CACHE_SIZE 가 0 이면 None (캐시 끔).
+    """
+    global _cache
+    if _cache is None:
+        size = current_app.config.get("RESPONSE_CACHE_SIZE", 128)
+        if not size:
+            return None
+        with _cache_lock:
+            if _cache is None:
+                _cache = LRUCache(maxsize=size)
+    return _cache
+
+
+def clear_response_cache() -> None:
+    if _cache is not None:
+        _cache.clear()
+
+
+def _variant() -> str:
+    # navbar 는 로그인 여부에 따라서만 달라진다 (사용자 이름 등은 표시하지 않음)
+    return "user" if g.get("user") else "anon"
+
+
+def _finish(page: CachedPage) -> Response:
+    response = Response(page.body, mimetype="text/html")
+    response.set_etag(page.etag)
+
+    max_age = current_app.config.get("RESPONSE_CACHE_MAX_AGE", 0)
+    # 로그인 여부(쿠키)에 따라 달라지므로 공유 캐시에는 저장하지 않게 private
+    response.cache_control.private = True
+    if max_age:
+        response.cache_control.max_age = max_age
+    else:
+        # 브라우저는 저장하되 매번 ETag 로 재검증 → 바뀌지 않았으면 304
+        response.cache_control.no_cache = True
+    response.vary.add("Cookie")
+    return response.make_conditional(request)
+
+
+def cached_page(key: Hashable, render: Callable[[], str]) -> Response:
+    """
+    key (+ 로그인 여부) 로 렌더링 결과를 캐시해서 조건부 응답을 만든다.
+    render() 는 캐시에 없을 때만 호출된다.
+
+        return cached_page(("predict.future", gu, future_version()),
+                           lambda: render_template(...))
+    """
+    cache = response_cache()
+    if cache is None:
+        body = render().encode("utf-8")
+        return _finish(CachedPage(_etag(body), body))
+
+    full_key = (key, _variant())
+    page = cache.get(full_key)
+    if page is None:
+        body = render().encode("utf-8")
+        page = CachedPage(_etag(body), body)
+        cache.set(full_key, page)
+    return _finish(page)
+
+
+def _etag(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()[:32]
@@ -1,10 +1,11 @@
-from flask import Blueprint,url_for,request,render_template
+from flask import Blueprint,url_for,request
 from ..forms import AnswerForm
 from werkzeug.utils import redirect
 from datetime import datetime
 
 from belong import db
 from belong.models import Question, Answer
+from .question_views import answer_last_page, render_detail
 
 bp=Blueprint('answer', __name__, url_prefix='/answer')
 
@@ -14,9 +15,10 @@ def create(question_id):
     question = Question.query.get_or_404(question_id)
     if form.validate_on_submit():
         content=request.form['content']
-        answer=Answer(content=content,create_date=datetime.now())
-        question.answer_set.append(answer)
+        # question.answer_set.append 는 기존 답변을 전부 읽으므로 question_id 로 바로 추가
+        answer=Answer(question_id=question.id,content=content,create_date=datetime.now())
+        db.session.add(answer)
         db.session.commit()
-        return redirect(url_for('question.detail',question_id=question_id))
+        return redirect(url_for('question.detail',question_id=question_id, page=answer_last_page(question_id)))
 
-    return render_template('question/question_detail.html',question=question, form=form)
\ No newline at end of file
+    return render_detail(question, form, answer_last_page(question_id))
\ No newline at end of file
@@ -1,10 +1,11 @@
-from flask import Blueprint, url_for, render_template, flash, request, session, g
+from flask import Blueprint, url_for, render_template, flash, request, session, g, current_app
 from sqlalchemy.testing.pickleable import User
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import redirect
 
 from belong import db
 from ..forms import UserCreateForm, UserLoginForm
+from ..identity import LazyUser, invalidate_user
 from ..models import Users
 
 bp = Blueprint('auth', __name__, url_prefix='/auth')
@@ -48,10 +49,16 @@ def load_logged_in_user():
     user_id = session.get('user_id')
     if user_id is None:
         g.user = None
+    elif current_app.config.get('LAZY_USER_LOADING', True):
+        # 실제로 g.user 를 쓸 때만 조회 (캐시 → DB)
+        g.user = LazyUser(user_id)
     else:
-        g.user = Users.query.get(user_id)
+        g.user = db.session.get(Users, user_id)
 
 @bp.route('/logout/')
 def logout():
+    user_id = session.get('user_id')
+    if user_id is not None:
+        invalidate_user(user_id)
     session.clear()
     return redirect(url_for('main.index'))
\ No newline at end of file
@@ -0,0 +1,57 @@
+"""
+/internal - 운영용 상태 조회 (허용되지 않은 요청은 404)
+
+- config.INTERNAL_TOKEN 이 있으면 X-Internal-Token 헤더가 일치해야 한다
+- 없으면 INTERNAL_ALLOWED_ADDRS 에서 직접 온 요청만 허용.
+  프록시를 거친 요청(X-Forwarded-For / Forwarded)은 remote_addr 가 프록시 주소라서
+  app.wsgi_app 에 ProxyFix 를 적용한 경우에만 주소를 믿는다.
+"""
+
+import hmac
+
+from flask import Blueprint, abort, current_app, jsonify, request
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+from .. import db
+from ..db_pool import pool_status
+
+bp = Blueprint("internal", __name__, url_prefix="/internal")
+
+_PROXY_HEADERS = ("X-Forwarded-For", "Forwarded")
+
+
+def _allowed() -> bool:
+    token = current_app.config.get("INTERNAL_TOKEN")
+    if token:
+        given = request.headers.get("X-Internal-Token", "")
+        return hmac.compare_digest(given.encode(), token.encode())
+
+    proxied = any(name in request.headers for name in _PROXY_HEADERS)
+    if proxied and not isinstance(current_app.wsgi_app, ProxyFix):
+        return False
+    return request.remote_addr in current_app.config.get("INTERNAL_ALLOWED_ADDRS", ())
+
+
+@bp.before_request
+def restrict_access():
+    if not _allowed():
+        abort(404)
+
+
+@bp.route("/db-pool")
+def db_pool():
+    """
+    /internal/db-pool - 커넥션 풀 크기 / 사용 중 / overflow + checkout 대기 시간 백분위수
+    """
+    return jsonify(pool_status(db.engine))
+
+
+@bp.route("/metrics")
+def metrics():
+    """
+    /internal/metrics - endpoint / SQL / ML / 템플릿 시간 히스토그램 (INSTRUMENTATION_ENABLED 일 때만)
+    """
+    registry = current_app.extensions.get("instrumentation")
+    if registry is None:
+        abort(404)
+    return jsonify(registry.snapshot())
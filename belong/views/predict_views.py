@@ -1,12 +1,33 @@
-from datetime import datetime
-from flask import Blueprint, render_template, request, flash, current_app
+import json
+import time
+
+import click
+from flask import Blueprint, Response, abort, current_app, render_template, request, flash, stream_with_context
 from werkzeug.utils import redirect
-from pathlib import Path
-import pandas as pd
 
 from .. import db
-from ..models import LonelyPrediction
-from ..ml.loader import available_regions, available_years, predict_for, get_future_curve_for_gu
+from ..ml.loader import (
+    all_predictions,
+    available_regions,
+    available_years,
+    data_version,
+    future_payload,
+    future_version,
+    predict_many,
+    get_future_curve_for_gu,
+    regenerate_future_store,
+)
+from ..ml.forecast import DEFAULT_END_YEAR, DEFAULT_START_YEAR
+from ..predictions import (
+    DEFAULT_BATCH_SIZE,
+    bulk_upsert,
+    clean_float,
+    lookup,
+    lookup_many,
+    predict_and_store,
+    prediction_rows,
+)
+from ..response_cache import cached_page
 
 bp = Blueprint("predict", __name__, url_prefix="/predict")
 
@@ -22,6 +43,19 @@ def index():
     regions = available_regions()
     years = available_years()
 
+    if request.method == "GET":
+        # 빈 폼은 CSV / 모델이 바뀔 때만 달라진다 → 렌더링 결과 캐시 + ETag
+        return cached_page(
+            ("predict.index", data_version()),
+            lambda: render_template(
+                "predict/form.html",
+                regions=regions,
+                years=years,
+                prediction=None,
+                from_cache=False,
+            ),
+        )
+
     prediction = None
     from_cache = False
 
@@ -44,26 +78,17 @@ def index():
                     from_cache=False,
                 )
 
-            # DB 캐시 조회
-            pred_row = LonelyPrediction.query.filter_by(gu=gu, year=year).first()
+            # 프로세스 캐시 → DB 순으로 조회
+            pred_row = lookup(gu, year)
 
             if pred_row:
                 prediction = pred_row
                 from_cache = True
             else:
-                # ML 예측 호출
-                result = predict_for(gu, year)
-
-                prediction = LonelyPrediction(
-                    gu=gu,
-                    year=year,
-                    predicted_value=result["y_pred"],
-                    actual_value=result.get("y_true"),
-                    created_at=datetime.now(),
-                )
-                db.session.add(prediction)
-                db.session.commit()
-                from_cache = False
+                # ML 예측 + 멱등 저장 (같은 키 동시 요청은 계산 하나를 공유하고,
+                # 비슷한 시점의 miss 들은 실행기에서 한 배치로 처리)
+                prediction, created = predict_and_store(gu, year)
+                from_cache = not created
 
     return render_template(
         "predict/form.html",
@@ -74,61 +99,167 @@ def index():
     )
 
 # ==========================================
-# 2) 미래 예측 (2026~2075 CSV 기반)
+# 1-1) 일괄 예측 JSON API (대시보드용)
 # ==========================================
 
-_FUTURE_DF = None
-PRED_COL = "예측값"
+# 결과가 이 행 수보다 많으면 JSON 배열을 나눠서 스트리밍 (chunk 단위로 조회 / 직렬화)
+BATCH_STREAM_THRESHOLD = 500
+_STREAM_CHUNK = 200
+# 요청 하나에서 조회할 수 있는 최대 (구, 연도) 수 (넘으면 400)
+BATCH_MAX_PAIRS = 5_000
 
 
-def _load_future_df() -> pd.DataFrame:
-    """미래 예측 CSV를 캐싱하여 로드"""
-    global _FUTURE_DF
-
-    if _FUTURE_DF is not None:
-        return _FUTURE_DF
-
-    csv_path = Path(current_app.root_path) / "ml" / "future_pred_2026_2075_v1_1_linear.csv"
-
-    df = pd.read_csv(csv_path)
-
-    required = {"구", "연도", PRED_COL}
-    if not required.issubset(df.columns):
-        raise RuntimeError(
-            f"미래 예측 CSV에 필요한 컬럼이 없습니다. 필요: {required}, 현재: {set(df.columns)}"
-        )
+def _batch_pairs():
+    """
+    요청에서 (구, 연도) 목록을 만든다.
 
-    df["연도"] = pd.to_numeric(df["연도"], errors="coerce").astype(int)
+    - POST JSON {"pairs": [["강남구", 2020], {"gu": "중구", "year": 2021}, ...]}
+    - POST JSON 또는 GET 쿼리 {"regions": [...], "year_from": 2018, "year_to": 2023}
+      (regions 생략 시 전체 구, 연도 생략 시 전체 연도)
+    - BATCH_MAX_PAIRS 개를 넘으면 400
+    """
+    if request.method == "POST":
+        params = request.get_json(silent=True)
+        if not isinstance(params, dict):
+            abort(400, description="JSON 본문이 필요합니다.")
+    else:
+        params = {
+            "regions": request.args.getlist("regions") or None,
+            "year_from": request.args.get("year_from", type=int),
+            "year_to": request.args.get("year_to", type=int),
+        }
+
+    if params.get("pairs") is not None:
+        if not isinstance(params["pairs"], list):
+            abort(400, description="pairs 는 (구, 연도) 항목의 배열이어야 합니다.")
+        if len(params["pairs"]) > BATCH_MAX_PAIRS:
+            abort(400, description=f"한 번에 최대 {BATCH_MAX_PAIRS}개까지 조회할 수 있습니다.")
+        pairs = []
+        for item in params["pairs"]:
+            try:
+                if isinstance(item, dict):
+                    pairs.append((str(item["gu"]), int(item["year"])))
+                else:
+                    gu, year = item
+                    pairs.append((str(gu), int(year)))
+            except (KeyError, TypeError, ValueError):
+                abort(400, description=f"잘못된 (구, 연도) 항목입니다: {item!r}")
+        return pairs
+
+    regions = params.get("regions")
+    if regions is None:
+        regions = available_regions()
+    elif not isinstance(regions, list) or not all(isinstance(gu, str) for gu in regions):
+        abort(400, description="regions 는 구 이름(문자열)의 배열이어야 합니다.")
 
-    _FUTURE_DF = df
-    return _FUTURE_DF
+    years = available_years()
+    year_from, year_to = params.get("year_from"), params.get("year_to")
+    try:
+        year_from = int(years[0] if year_from is None else year_from)
+        year_to = int(years[-1] if year_to is None else year_to)
+    except (TypeError, ValueError, IndexError):
+        abort(400, description="연도 범위가 올바르지 않습니다.")
+
+    pairs = [(gu, y) for gu in regions for y in years if year_from <= y <= year_to]
+    if len(pairs) > BATCH_MAX_PAIRS:
+        abort(400, description=f"한 번에 최대 {BATCH_MAX_PAIRS}개까지 조회할 수 있습니다.")
+    return pairs
+
+
+def _batch_items(pairs):
+    """_STREAM_CHUNK 개씩 예측값 + 저장값을 조회해서 JSON 항목 리스트를 yield"""
+    for start in range(0, len(pairs), _STREAM_CHUNK):
+        chunk = pairs[start:start + _STREAM_CHUNK]
+        results = predict_many(chunk)
+        stored = lookup_many(pair for pair, r in zip(chunk, results) if r is not None)
+
+        items = []
+        for (gu, year), result in zip(chunk, results):
+            if result is None:
+                items.append({"gu": gu, "year": year, "error": "데이터에 존재하지 않는 (구, 연도) 조합입니다."})
+                continue
+            row = stored.get((gu, year))
+            items.append({
+                "gu": gu,
+                "year": year,
+                "predicted_value": row.predicted_value if row else result["y_pred"],
+                "actual_value": row.actual_value if row else clean_float(result["y_true"]),
+                "model_version": result["model_version"],
+                "from_cache": row is not None,
+            })
+        yield items
+
+
+def _dumps(items) -> str:
+    return ",".join(json.dumps(item, ensure_ascii=False) for item in items)
+
+
+@bp.route("/batch", methods=("GET", "POST"))
+def batch():
+    """
+    /predict/batch - 여러 (구, 연도)의 예측값을 JSON 으로 반환
 
+    - 모델 예측값은 사전 계산 테이블에서 배열 조회 한 번으로 (chunk 마다)
+    - 저장된 LonelyPrediction 은 캐시 + 쿼리 한 번으로 (chunk 마다)
+    - 결과가 크면 chunk 를 조회하는 대로 JSON 배열을 스트리밍
+      (전체 결과 리스트를 메모리에 만들지 않는다)
+    """
+    pairs = _batch_pairs()
 
-def _future_regions():
-    df = _load_future_df()
-    return sorted(df["구"].dropna().unique().tolist())
+    if len(pairs) <= BATCH_STREAM_THRESHOLD:
+        body = ",".join(_dumps(items) for items in _batch_items(pairs))
+        return Response(f"[{body}]", mimetype="application/json")
 
+    def generate():
+        yield "["
+        for k, items in enumerate(_batch_items(pairs)):
+            yield ("," if k else "") + _dumps(items)
+        yield "]"
 
-def _future_series_for_gu(gu: str):
-    df = _load_future_df()
+    # DB 조회가 응답 본문을 만드는 중에 일어나므로 요청 컨텍스트를 유지
+    return Response(stream_with_context(generate()), mimetype="application/json")
 
-    df_gu = df[df["구"] == gu].copy()
-    if df_gu.empty:
-        return [], [], []
 
-    df_gu = df_gu.sort_values("연도")
-    df_gu["예측값_명"] = df_gu[PRED_COL].round().astype(int)
+@bp.cli.command("backfill")
+@click.option("--batch-size", default=DEFAULT_BATCH_SIZE, show_default=True,
+              help="executemany / MERGE 한 번에 보낼 행 수")
+@click.option("--create-tables", is_flag=True,
+              help="테이블이 없으면 생성 (로컬 SQLite 벤치마크용)")
+def backfill(batch_size, create_tables):
+    """
+    전체 (구, 연도) 예측값을 LonelyPrediction 에 일괄 upsert.
+    """
+    if create_tables:
+        db.create_all()
 
-    years = df_gu["연도"].tolist()
-    values = df_gu["예측값_명"].tolist()
+    started = time.perf_counter()
+    rows = prediction_rows(all_predictions())
+    count = bulk_upsert(rows, batch_size=batch_size)
+    elapsed = time.perf_counter() - started
 
-    table_rows = df_gu[["연도", PRED_COL, "예측값_명"]].rename(
-        columns={PRED_COL: "예측값"}
-    ).to_dict(orient="records")
+    click.echo(
+        f"{len(rows)}행 upsert 완료 (반영 {count}행, "
+        f"{db.engine.dialect.name}, {elapsed:.3f}s)"
+    )
 
-    return years, values, table_rows
 
+@bp.cli.command("forecast")
+@click.option("--start", "start_year", default=DEFAULT_START_YEAR, show_default=True,
+              help="CSV 에 기록할 첫 연도")
+@click.option("--end", "end_year", default=DEFAULT_END_YEAR, show_default=True,
+              help="마지막 예측 연도")
+def forecast(start_year, end_year):
+    """
+    현재 모델로 미래 예측 CSV(FUTURE_PRED_PATH)를 재귀 예측해서 다시 생성.
+    """
+    started = time.perf_counter()
+    count = regenerate_future_store(start_year, end_year)
+    elapsed = time.perf_counter() - started
+    click.echo(f"{start_year}~{end_year} 미래 예측 {count}행 저장 완료 ({elapsed:.3f}s)")
 
+# ==========================================
+# 2) 미래 예측 (2026~2075 CSV 기반)
+# ==========================================
 
 @bp.route("/future", methods=["GET", "POST"])
 def future():
@@ -142,16 +273,73 @@ def future():
 
     if request.method == "POST":
         selected_gu = request.form.get("gu") or selected_gu
+    else:
+        selected_gu = request.args.get("gu") or selected_gu
+
+    # 목록에 없는 구는 캐시 키로 쓰지 않는다 (임의의 ?gu= 값으로 LRU 를 밀어내지 못하게)
+    if selected_gu is not None and selected_gu not in gu_list:
+        abort(404)
+
+    def render():
+        # 특정 구의 미래 예측 50년 데이터
+        records = []
+        if selected_gu:
+            records = get_future_curve_for_gu(selected_gu)  # [{연도, 예측값, 예측값_명}, ...]
+
+        # 템플릿 렌더링
+        return render_template(
+            "predict/future_predict.html",
+            gu_list=gu_list,
+            selected_gu=selected_gu,
+            records=records
+        )
 
-    # 특정 구의 미래 예측 50년 데이터
-    records = []
-    if selected_gu:
-        records = get_future_curve_for_gu(selected_gu)  # [{연도, 예측값, 예측값_명}, ...]
+    # 곡선은 미래 예측 CSV 가, 구 목록(<select>)은 Dataset_ML 스냅샷이 바뀔 때만 바뀐다
+    # → (구, 미래 CSV 버전, 데이터 버전)별 렌더링 결과 캐시
+    return cached_page(
+        ("predict.future", selected_gu, future_version(), data_version()), render
+    )
 
-    # 템플릿 렌더링
-    return render_template(
-        "predict/future_predict.html",
-        gu_list=gu_list,
-        selected_gu=selected_gu,
-        records=records
-    )
\ No newline at end of file
+
+# ==========================================
+# 2-1) 미래 예측 곡선 JSON API (차트용)
+#  - 로드 시 미리 직렬화 / 압축한 bytes 를 그대로 반환 (요청마다 직렬화 없음)
+# ==========================================
+
+def _payload_response(payload):
+    """Accept-Encoding 에 맞는 미리 압축된 본문 + strong ETag / Cache-Control / 304"""
+    accepted = request.accept_encodings
+    if payload.br is not None and accepted["br"]:
+        encoding, suffix = "br", "-br"
+    elif accepted["gzip"]:
+        encoding, suffix = "gzip", "-gz"
+    else:
+        encoding, suffix = None, ""
+
+    response = Response(payload.body(encoding), mimetype="application/json")
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    response.set_etag(payload.etag + suffix)
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config.get("FUTURE_JSON_MAX_AGE", 300)
+    return response.make_conditional(request)
+
+
+@bp.route("/future/all.json")
+def future_all_json():
+    """
+    /predict/future/all.json - 전체 구 미래 예측 (연도 축 한 번 + 구별 값 배열)
+    """
+    return _payload_response(future_payload())
+
+
+@bp.route("/future/<gu>.json")
+def future_json(gu):
+    """
+    /predict/future/<구>.json - 구 하나의 미래 예측 {"gu", "years", "values", "rounded"}
+    """
+    payload = future_payload(gu)
+    if payload is None:
+        abort(404, description=f"미래 예측 데이터에 없는 구입니다: {gu}")
+    return _payload_response(payload)
@@ -1,24 +1,99 @@
-from flask import Blueprint, render_template,request,url_for
-from ..models import Question
+from flask import Blueprint, render_template,request,url_for,current_app
+from sqlalchemy import event, func
+from ..models import Question, Answer
 from ..forms import QuestionForm,AnswerForm
+from ..pagination import CachedCount, keyset_paginate
 from datetime import datetime
 from werkzeug.utils import redirect
 from .. import db
 
 bp = Blueprint('question',__name__, url_prefix='/question')
 
+_question_count = None
+
+
+def question_count():
+    """
+    질문 전체 건수 (QUESTION_COUNT_TTL 초 동안 캐시된 대략값).
+    QUESTION_COUNT_TTL 이 None 이면 건수를 세지 않고 None.
+    """
+    global _question_count
+    ttl = current_app.config.get('QUESTION_COUNT_TTL', 60)
+    if ttl is None:
+        return None
+    if _question_count is None:
+        _question_count = CachedCount(ttl=ttl)
+    return _question_count.get('question', Question.query)
+
+
+@event.listens_for(Question, 'after_insert')
+@event.listens_for(Question, 'after_delete')
+def _invalidate_count(mapper, connection, target):
+    if _question_count is not None:
+        _question_count.invalidate()
+
+
+def answer_counts(questions):
+    """질문 id → 답변 수 (한 페이지 분량을 GROUP BY 쿼리 한 번으로)"""
+    ids = [question.id for question in questions]
+    if not ids:
+        return {}
+    rows = (
+        db.session.query(Answer.question_id, func.count(Answer.id))
+        .filter(Answer.question_id.in_(ids))
+        .group_by(Answer.question_id)
+        .all()
+    )
+    return dict(rows)
+
+
+ANSWER_PER_PAGE = 10
+
+
+def answer_last_page(question_id):
+    """마지막 답변 페이지 번호 (새 답변 등록 후 이동할 페이지)"""
+    count = Answer.query.filter_by(question_id=question_id).count()
+    return max((count - 1) // ANSWER_PER_PAGE + 1, 1)
+
+
+def render_detail(question, form, page=1):
+    """
+    질문 상세 + 답변 한 페이지.
+    답변은 question_id 인덱스로 한 페이지만 쿼리 한 번 (+ 건수) 으로 읽는다
+    (question.answer_set 을 건드리면 전체 답변을 읽으므로 쓰지 않는다).
+    범위를 벗어난 page (답변 삭제 후 남은 ?page=N 등) 는 404 대신 첫 / 마지막 페이지로 맞춘다.
+    """
+    query = Answer.query.filter_by(question_id=question.id).order_by(Answer.create_date, Answer.id)
+    answer_list = query.paginate(page=max(page, 1), per_page=ANSWER_PER_PAGE, error_out=False)
+    if answer_list.pages and answer_list.page > answer_list.pages:
+        answer_list = query.paginate(page=answer_list.pages, per_page=ANSWER_PER_PAGE, error_out=False)
+    return render_template('question/question_detail.html', question=question, answer_list=answer_list, form=form)
+
+
 @bp.route('/list/')
 def _list():
+    if current_app.config.get('QUESTION_LIST_KEYSET', True):
+        # ?after=<커서> 다음 페이지, ?before=<커서> 이전 페이지 (OFFSET 없음)
+        question_list = keyset_paginate(
+            Question.query, Question.create_date, Question.id, per_page=10,
+            after=request.args.get('after'), before=request.args.get('before'),
+            total=question_count(),
+        )
+        return render_template('question/question_list.html', question_list=question_list, keyset=True,
+                               answer_counts=answer_counts(question_list.items))
+
     page = request.args.get('page', type=int, default=1)
     question_list = Question.query.order_by(Question.create_date.desc())
     question_list = question_list.paginate(page=page, per_page=10)
-    return render_template('question/question_list.html', question_list=question_list)
+    return render_template('question/question_list.html', question_list=question_list, keyset=False,
+                           answer_counts=answer_counts(question_list.items))
 
 @bp.route('/detail/<int:question_id>/')
 def detail(question_id):
     form = AnswerForm()
     question = Question.query.get_or_404(question_id)
-    return render_template('question/question_detail.html',question=question, form=form)
+    page = request.args.get('page', type=int, default=1)
+    return render_detail(question, form, page)
 
 @bp.route('/create/',methods=['GET','POST'])
 def create():
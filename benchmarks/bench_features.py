@@ -0,0 +1,73 @@
+"""
+benchmarks.bench_features
+
+- preprocess.add_engineered_features (배열 기반) 와
+  기존 groupby / apply 구현의 속도 비교 + 결과 일치 확인
+- 구 수를 25 → 10,000+ 로 늘려가며 측정
+
+사용법:
+    python -m benchmarks.bench_features [구 수 ...]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+import pandas as pd
+
+from belong.ml import TARGET_COL
+from belong.ml.preprocess import add_engineered_features
+
+from .synthetic import make_raw_panel
+
+DEFAULT_GROUPS = (25, 250, 2_500, 10_000, 25_000)
+N_YEARS = 15
+
+
+def groupby_reference(df: pd.DataFrame) -> pd.DataFrame:
+    """이전 구현 (groupby.shift + groupby.apply(rolling)) — 비교용"""
+    df = df.copy()
+    df = df.sort_values(["구", "연도"])
+    df["lag_1"] = df.groupby("구")[TARGET_COL].shift(1)
+    df["lag_2"] = df.groupby("구")[TARGET_COL].shift(2)
+    roll = df.groupby("구")[TARGET_COL].apply(lambda x: x.rolling(3).mean())
+    df["roll_3"] = roll.reset_index(level=0, drop=True)
+    df["인구x노령화"] = df["총인구"] * df["노령화지수"]
+    df["노인비x저소득"] = df["65세 이상"] * df["저소득노인_80이상비율"]
+    return df.dropna(subset=["lag_1", "lag_2", "roll_3"]).reset_index(drop=True)
+
+
+def _best_of(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(groups=DEFAULT_GROUPS):
+    rows = []
+    for n_groups in groups:
+        df = make_raw_panel(n_groups, N_YEARS, one_hot=False)
+        df["연도"] = df["연도"].astype("Int64")
+
+        expected = groupby_reference(df)
+        actual = add_engineered_features(df)
+        pd.testing.assert_frame_equal(actual, expected, check_exact=False, rtol=1e-12)
+
+        t_new = _best_of(lambda: add_engineered_features(df))
+        t_old = _best_of(lambda: groupby_reference(df), repeat=1 if n_groups > 2_500 else 3)
+        rows.append((n_groups, len(df), t_old, t_new))
+        print(
+            f"구 {n_groups:>6,d}  행 {len(df):>8,d}  "
+            f"groupby {t_old * 1e3:9.1f} ms  배열 {t_new * 1e3:8.1f} ms  "
+            f"x{t_old / t_new:6.1f}"
+        )
+    return rows
+
+
+if __name__ == "__main__":
+    groups = [int(a) for a in sys.argv[1:]] or DEFAULT_GROUPS
+    run(groups)
@@ -0,0 +1,151 @@
+"""
+benchmarks.bench_pool
+
+- 커넥션 풀 설정별 부하 테스트 (Oracle 대신 로컬 SQLite 파일 DB)
+    - 새 커넥션 생성 비용을 dialect do_connect 이벤트에서 CONNECT_MS 만큼 지연시켜 흉내
+      (Oracle 은 로그온 / 세션 생성에 수십 ms)
+    - 각 요청은 커넥션을 받아 쿼리 하나 + QUERY_MS 동안 붙잡고 있다가 반납
+    - THREADS 개 스레드가 동시에 REQUESTS 번씩 요청
+- 설정: SQLAlchemy 기본 풀, 작은 풀, 풀 없음(NullPool), config 의 프로필들
+- 요청당 checkout 대기 시간 p50 / p95 / max, 새 커넥션 수, 타임아웃 수, 처리량 비교
+  (QueuePool 계열은 belong.db_pool.pool_metrics 계측값도 같이 확인)
+
+사용법:
+    python -m benchmarks.bench_pool [스레드 수] [스레드당 요청 수]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+CONNECT_MS = 20
+QUERY_MS = 5
+DEFAULT_THREADS = 8
+DEFAULT_REQUESTS = 50
+
+
+def _configs() -> Dict[str, Optional[Dict[str, Any]]]:
+    import config
+
+    configs: Dict[str, Optional[Dict[str, Any]]] = {
+        "sqlalchemy-default": {},
+        "small (2+0)": {"pool_size": 2, "max_overflow": 0, "pool_timeout": 2},
+        "no-pool (NullPool)": None,
+    }
+    for name, profile in config.DB_POOL_PROFILES.items():
+        configs[f"profile:{name}"] = profile
+    return configs
+
+
+def _make_engine(uri: str, profile: Optional[Dict[str, Any]]):
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.pool import NullPool
+
+    from belong.db_pool import engine_options
+
+    if profile is None:
+        engine = create_engine(uri, poolclass=NullPool)
+    else:
+        engine = create_engine(uri, **engine_options(uri, profile))
+
+    @event.listens_for(engine, "do_connect")
+    def slow_connect(dialect, conn_rec, cargs, cparams):
+        time.sleep(CONNECT_MS / 1000)   # 원격 DB 로그온 비용 흉내 (실제 연결은 기본 동작)
+
+    return engine
+
+
+def measure(uri: str, profile: Optional[Dict[str, Any]], threads: int, requests: int) -> Dict[str, Any]:
+    from sqlalchemy import event, text
+
+    from belong.db_pool import pool_metrics
+
+    engine = _make_engine(uri, profile)
+    connects = {"n": 0}
+
+    @event.listens_for(engine, "connect")
+    def count(dbapi_connection, connection_record):
+        connects["n"] += 1
+
+    pool_metrics.reset()
+    waits = []
+    errors = {"n": 0}
+    lock = threading.Lock()
+
+    def worker():
+        local = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            try:
+                with engine.connect() as conn:
+                    local.append(time.perf_counter() - started)
+                    conn.execute(text("SELECT count(*) FROM item")).scalar()
+                    time.sleep(QUERY_MS / 1000)   # 쿼리 / 트랜잭션 동안 커넥션 점유
+            except Exception:
+                with lock:
+                    errors["n"] += 1
+        with lock:
+            waits.extend(local)
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    waits.sort()
+
+    def pct(q):
+        return waits[min(int(q * len(waits)), len(waits) - 1)] * 1000 if waits else 0.0
+
+    result = {
+        "requests": len(waits),
+        "errors": errors["n"],
+        "connects": connects["n"],
+        "wait_p50_ms": pct(0.50),
+        "wait_p95_ms": pct(0.95),
+        "wait_max_ms": waits[-1] * 1000 if waits else 0.0,
+        "req_per_s": len(waits) / elapsed,
+        "pool_metrics": pool_metrics.snapshot() if profile is not None else None,
+    }
+    engine.dispose()
+    return result
+
+
+def run(threads: int = DEFAULT_THREADS, requests: int = DEFAULT_REQUESTS):
+    from sqlalchemy import create_engine, text
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        uri = f"sqlite:///{os.path.join(tmp, 'pool.db')}"
+        setup = create_engine(uri)
+        with setup.begin() as conn:
+            conn.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY)"))
+            conn.execute(text("INSERT INTO item (id) VALUES (1), (2), (3)"))
+        setup.dispose()
+
+        for name, profile in _configs().items():
+            results[name] = measure(uri, profile, threads, requests)
+
+    print(f"{threads} threads x {requests} requests, connect {CONNECT_MS} ms, hold {QUERY_MS} ms")
+    print(f"{'config':22s} {'req/s':>7s} {'connects':>8s} {'errors':>6s} "
+          f"{'wait p50':>9s} {'p95':>7s} {'max':>7s} {'peak in use':>11s}")
+    for name, r in results.items():
+        peak = r["pool_metrics"]["peak_in_use"] if r["pool_metrics"] else "-"
+        print(f"{name:22s} {r['req_per_s']:7.1f} {r['connects']:8d} {r['errors']:6d} "
+              f"{r['wait_p50_ms']:8.2f}ms {r['wait_p95_ms']:5.1f}ms {r['wait_max_ms']:5.1f}ms {peak:>11}")
+    return results
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_THREADS,
+        int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_REQUESTS,
+    )
@@ -0,0 +1,102 @@
+"""
+benchmarks.bench_queries
+
+- 로그인한 사용자 기준 페이지별 DB 쿼리 수 비교
+    - eager : 예전 방식 (before_app_request 에서 매번 Users 조회, LAZY_USER_LOADING=False)
+    - lazy  : g.user 지연 로딩 + 사용자 캐시 (belong.identity)
+- 임시 SQLite DB 에 사용자 / 질문을 만들고 각 페이지를 여러 번 요청해서
+  요청당 평균 SQL 문 수를 센다 (engine before_cursor_execute 이벤트)
+
+사용법:
+    python -m benchmarks.bench_queries [요청 수]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+DEFAULT_VIEWS = 20
+
+PAGES = [
+    "/",
+    "/question/list/",
+    "/static/style.css",
+    "/predict/future",
+    "/auth/login/",
+]
+
+
+def _make_app(db_path: str, lazy: bool):
+    import config
+    from belong import create_app, db
+    from belong.models import Question, Users
+
+    config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{db_path}"
+    app = create_app()
+    app.config.update(LAZY_USER_LOADING=lazy, WTF_CSRF_ENABLED=False)
+
+    with app.app_context():
+        db.create_all()
+        if Users.query.first() is None:
+            db.session.add(Users(username="bench", password="x", email="bench@example.com"))
+            for i in range(30):
+                db.session.add(Question(subject=f"질문 {i}", content="내용", create_date=datetime.now()))
+            db.session.commit()
+    return app
+
+
+def measure(lazy: bool, views: int = DEFAULT_VIEWS, db_path: str = None):
+    """페이지별 (상태 코드, 요청당 평균 쿼리 수)"""
+    from sqlalchemy import event
+
+    from belong import db
+    from belong.identity import invalidate_user
+
+    app = _make_app(db_path, lazy)
+    invalidate_user()
+
+    counter = {"n": 0}
+
+    def count(*args):
+        counter["n"] += 1
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", count)
+
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess["user_id"] = 1
+
+    result = {}
+    try:
+        for page in PAGES:
+            counter["n"] = 0
+            status = None
+            for _ in range(views):
+                status = client.get(page).status_code
+            result[page] = (status, counter["n"] / views)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return result
+
+
+def run(views: int = DEFAULT_VIEWS):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        eager = measure(False, views, db_path)
+        lazy = measure(True, views, db_path)
+
+    print(f"{'page':22s} {'status':>6s} {'eager q/req':>12s} {'lazy q/req':>11s}")
+    for page in PAGES:
+        status, before = eager[page]
+        _, after = lazy[page]
+        print(f"{page:22s} {status:>6} {before:12.2f} {after:11.2f}")
+    return eager, lazy
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_VIEWS)
@@ -0,0 +1,116 @@
+"""
+benchmarks.check_fast_predict
+
+- fast_predict.CompiledModel 이 원본 파이프라인(ColumnTransformer + XGBRegressor)과
+  같은 예측값을 내는지 확인 (XGBoost JSON 스키마 / 결측값 방향 / base_score 변화 감시용)
+    - 합성 패널을 연도로 나눠 앞쪽으로 학습, 마지막 몇 년(held-out)으로 비교
+    - 학습 / 비교 데이터에 NaN 을 섞은 경우 (default_left 경로),
+      학습 범위를 벗어난 값, 트리 깊이 / 수 / base_score 를 바꾼 설정,
+      StandardScaler(with_mean / with_std=False) 설정
+    - .npz 저장 → 로드 후에도 같은지 확인
+- 오차가 fast_predict.PARITY_RTOL / PARITY_ATOL 을 넘으면 종료 코드 1
+
+사용법:
+    python -m benchmarks.check_fast_predict [구 수] [연도 수]
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+from belong.ml import FINAL_FEATURES, NUMERIC_FEATURES, TARGET_COL
+from belong.ml.fast_predict import CompiledModel, compile_pipeline, verify_parity
+from belong.ml.preprocess import add_engineered_features
+from belong.ml.train_lonely_death import build_pipeline
+
+from .synthetic import make_raw_panel
+
+DEFAULT_GROUPS = 25
+DEFAULT_YEARS = 15
+HELD_OUT_YEARS = 3
+NAN_FRACTION = 0.2
+
+# (이름, XGBRegressor 파라미터, 학습 데이터에도 NaN 을 넣을지, StandardScaler 파라미터)
+CONFIGS = [
+    ("shallow", {"n_estimators": 50, "max_depth": 3, "learning_rate": 0.1}, False, {}),
+    ("deep", {"n_estimators": 200, "max_depth": 8, "learning_rate": 0.05}, False, {}),
+    ("nan-trained", {"n_estimators": 100, "max_depth": 5, "learning_rate": 0.1}, True, {}),
+    ("base-score", {"n_estimators": 80, "max_depth": 4, "base_score": 0.5}, False, {}),
+    ("no-center", {"n_estimators": 80, "max_depth": 4}, False, {"with_mean": False}),
+    ("no-scale", {"n_estimators": 80, "max_depth": 4}, False, {"with_std": False}),
+]
+
+
+def _with_nans(X: pd.DataFrame, seed: int) -> pd.DataFrame:
+    """수치 피처 셀의 NAN_FRACTION 을 NaN 으로 (구 원-핫 컬럼은 그대로)"""
+    rng = np.random.default_rng(seed)
+    X = X.copy()
+    for col in NUMERIC_FEATURES:
+        X.loc[rng.random(len(X)) < NAN_FRACTION, col] = np.nan
+    return X
+
+
+def _out_of_range(X: pd.DataFrame) -> pd.DataFrame:
+    """수치 피처를 학습 범위 밖으로 (양쪽 끝 분기 확인)"""
+    X = X.copy()
+    half = len(X) // 2
+    for col in NUMERIC_FEATURES:
+        X.loc[X.index[:half], col] = X[col].max() * 10
+        X.loc[X.index[half:], col] = X[col].min() - abs(X[col].min()) * 10 - 1
+    return X
+
+
+def run(groups: int = DEFAULT_GROUPS, years: int = DEFAULT_YEARS) -> bool:
+    df = add_engineered_features(make_raw_panel(groups, years, one_hot=True, seed=0))
+    cutoff = int(df["연도"].max()) - HELD_OUT_YEARS
+    train, test = df[df["연도"] <= cutoff], df[df["연도"] > cutoff]
+
+    held_out = test[FINAL_FEATURES]
+    cases = {
+        "held-out": held_out,
+        "held-out+NaN": _with_nans(held_out, seed=1),
+        "out-of-range": _out_of_range(held_out),
+    }
+
+    ok = True
+    with tempfile.TemporaryDirectory(prefix="belong-parity-") as tmp:
+        for name, params, nan_train, scaler in CONFIGS:
+            X_train = train[FINAL_FEATURES]
+            if nan_train:
+                X_train = _with_nans(X_train, seed=2)
+            pipeline = build_pipeline(**params)
+            if scaler:
+                pipeline.set_params(preprocess__num=StandardScaler(**scaler))
+            pipeline.fit(X_train, train[TARGET_COL])
+
+            compiled = compile_pipeline(pipeline, model_path=Path(tmp) / "missing.pkl")
+            path = Path(tmp) / f"{name}.npz"
+            compiled.save(path)
+            models = {"compiled": compiled, "loaded": CompiledModel.load(path)}
+
+            for case, X in cases.items():
+                for kind, model in models.items():
+                    try:
+                        err = verify_parity(pipeline, model, X)
+                        status = f"max err {err:.2e}"
+                    except AssertionError as exc:
+                        ok = False
+                        status = "MISMATCH\n" + str(exc)
+                    print(f"{name:12s} {case:14s} {kind:9s} {len(X):5d} rows  {status}")
+
+    print("OK" if ok else "FAILED")
+    return ok
+
+
+if __name__ == "__main__":
+    ok = run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_GROUPS,
+        int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_YEARS,
+    )
+    sys.exit(0 if ok else 1)
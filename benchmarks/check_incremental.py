@@ -0,0 +1,124 @@
+"""
+benchmarks.check_incremental
+
+- loader.append_rows (증분 반영) 결과가 전체 재계산과 같은지 확인 (loader.check_consistency)
+    - 합성 패널에서 마지막 N 년을 빼고 로드한 뒤 한 해씩
+      Dataset_ML.csv 에 덧붙이고 → append_rows 호출
+    - 증분 반영 후 다음 조회에서 전체 재계산이 일어나지 않는지도 확인
+    - 다른 요청이 먼저 전체 재계산한 경우(append_rows 가 0 을 반환)도 확인
+    - 반영할 때마다 data_version() (페이지 / 예측 캐시 키) 과 연도 목록이 바뀌는지 확인
+    - CSV 는 그대로 두고 메모리에만 반영하는 경우도 확인
+- 임시 디렉터리에서 실행 (benchmarks.suite 와 같은 준비 과정, 새 프로세스에서 실행)
+- 불일치가 있으면 종료 코드 1
+
+사용법:
+    python -m benchmarks.check_incremental [구 수] [연도 수] [증분 연도 수]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+DEFAULT_GROUPS = 25
+DEFAULT_YEARS = 15
+DEFAULT_APPENDED = 3
+
+
+def _write_csv(df: pd.DataFrame, path: Path) -> None:
+    """CSV 저장 (파일 시스템 mtime 해상도 때문에 서명이 그대로면 1초 밀어 둔다)"""
+    before = os.stat(path).st_mtime_ns if path.exists() else None
+    df.to_csv(path, index=False)
+    after = os.stat(path).st_mtime_ns
+    if after == before:
+        os.utime(path, ns=(after + 1_000_000_000, after + 1_000_000_000))
+
+
+def _check_version(loader, before: str, year: int) -> bool:
+    """증분 반영 후 data_version() 이 바뀌고 연도 목록 / 예측 테이블에 새 연도가 보이는지"""
+    after = loader.data_version()
+    visible = year in loader.available_years() and any(
+        y == year for _, y in loader.prediction_table()
+    )
+    if after == before or not visible:
+        print(f"{year}: data_version {before} → {after}, 새 연도 조회 {'됨' if visible else '안 됨'}")
+        return False
+    return True
+
+
+def run(groups: int = DEFAULT_GROUPS, years: int = DEFAULT_YEARS,
+        appended: int = DEFAULT_APPENDED) -> bool:
+    from .suite import prepare
+    from .synthetic import make_raw_panel
+
+    ok = True
+    with tempfile.TemporaryDirectory(prefix="belong-check-") as tmp:
+        prepare(Path(tmp), groups, years, seed=0)
+
+        from belong.ml import DATA_PATH
+        from belong.ml import loader
+        from belong.ml.preprocess import load_raw_data
+
+        panel = make_raw_panel(groups, years, seed=0)
+        last_year = int(panel["연도"].max())
+        first_new = last_year - appended + 1
+
+        _write_csv(panel[panel["연도"] < first_new], DATA_PATH)
+        loader.warmup()
+
+        for year in range(first_new, last_year + 1):
+            version = loader.data_version()   # CSV 를 바꾸기 전 (바꾼 뒤 조회하면 전체 재계산)
+            _write_csv(panel[panel["연도"] <= year], DATA_PATH)
+            # CSV 에 덧붙인 그대로 (파싱 결과가 메모리 값과 마지막 자리까지 같지는 않다)
+            raw = load_raw_data(DATA_PATH)
+            rows = raw[raw["연도"] == year]
+
+            if year == last_year:
+                # 다른 요청이 CSV 변경을 먼저 보고 전체 재계산한 경우
+                loader.model_version()
+                added = loader.append_rows(rows)
+                expected = 0
+            else:
+                added = loader.append_rows(rows)
+                expected = len(rows)
+                ok &= _check_version(loader, version, year)
+
+            snapshot = loader._snapshot
+            rebuilt = loader._current() is not snapshot
+            mismatched = loader.check_consistency()
+
+            print(f"{year}: append_rows → {added} (기대 {expected}), "
+                  f"다음 조회 전체 재계산 {'있음' if rebuilt else '없음'}, "
+                  f"불일치 {len(mismatched)}")
+            if added != expected or rebuilt or mismatched:
+                ok = False
+                if mismatched:
+                    print(f"    예: {mismatched[:5]}")
+
+        # CSV 는 그대로 두고 메모리에만 다음 연도 반영 (mtime 이 그대로여도 버전은 바뀌어야 함)
+        raw = load_raw_data(DATA_PATH)
+        rows = raw[raw["연도"] == last_year].assign(연도=last_year + 1)
+        version = loader.data_version()
+        added = loader.append_rows(rows)
+        ok &= _check_version(loader, version, last_year + 1)
+        mismatched = loader.check_consistency(pd.concat([raw, rows], ignore_index=True))
+        print(f"{last_year + 1} (CSV 그대로): append_rows → {added} (기대 {len(rows)}), "
+              f"불일치 {len(mismatched)}")
+        if added != len(rows) or mismatched:
+            ok = False
+
+    print("OK" if ok else "FAILED")
+    return ok
+
+
+if __name__ == "__main__":
+    ok = run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_GROUPS,
+        int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_YEARS,
+        int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_APPENDED,
+    )
+    sys.exit(0 if ok else 1)
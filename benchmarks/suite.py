@@ -0,0 +1,348 @@
+"""
+benchmarks.suite
+
+- ML / 웹 주요 경로 벤치마크 묶음 (오프라인, 재현 가능)
+    - 임시 디렉터리에 합성 Dataset_ML.csv (synthetic.py, 구 수 / 연도 수 지정) 를 만들고
+      작은 모델 학습 → 레지스트리 등록 → 미래 예측 CSV 생성 → SQLite DB 까지 준비
+    - belong.ml 의 경로 상수(DATA_PATH 등)를 임시 디렉터리로 바꾼 뒤 하위 모듈을 import 하므로
+      저장소의 실제 모델 / CSV 는 건드리지 않는다 (새 프로세스에서 실행해야 함)
+- 측정 항목
+    - ml.*  : build_feature_dataframe, predict_for (단건), predict_many (전체 배치),
+              get_future_curve_for_gu
+    - web.* : /predict/ (GET, POST), /predict/future, /question/list/ (첫 페이지, 깊은 페이지)
+              Flask test client + SQLite
+- 결과는 JSON (커밋 / 환경 / 데이터 크기 + 항목별 min / median / mean 초)
+  compare 로 두 결과를 비교해서 threshold 보다 느려진 항목이 있으면 종료 코드 1
+    - 기본 비교 기준은 min (라운드 중 가장 빠른 값: 다른 프로세스 / GC 영향이 가장 적음),
+      --stat median 으로 바꿀 수 있다
+
+사용법:
+    python -m benchmarks.suite run --out base.json              # 기준 커밋에서
+    python -m benchmarks.suite run --out new.json               # 변경 후
+    python -m benchmarks.suite compare base.json new.json --threshold 0.15
+    python -m benchmarks.suite run --groups 250 --years 30 --only ml.
+"""
+
+from __future__ import annotations
+
+import gc
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_GROUPS = 25
+DEFAULT_YEARS = 15
+DEFAULT_ROUNDS = 5
+DEFAULT_MIN_TIME = 0.05          # 한 라운드 최소 시간(초) → 반복 횟수 자동 결정
+DEFAULT_THRESHOLD = 0.15         # 15% 넘게 느려지면 회귀
+DEFAULT_STAT = "min"
+BENCH_ESTIMATORS = 100           # 벤치마크용 모델 트리 수 (학습 시간 단축, 추론 경로는 동일)
+N_QUESTIONS = 1_000
+
+
+# ==========================================
+# 측정
+# ==========================================
+
+def measure(fn: Callable[[], Any], rounds: int = DEFAULT_ROUNDS,
+            min_time: float = DEFAULT_MIN_TIME) -> Dict[str, Any]:
+    """
+    timeit 과 같은 방식: 한 번 예열 → 한 라운드가 min_time 이상 걸리는 반복 수를 정하고
+    rounds 번 측정해서 1회당 시간 통계를 반환.
+    """
+    gc.collect()
+    fn()
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - started >= min_time or number >= 1_000_000:
+            break
+        number *= 2
+
+    per_call = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        per_call.append((time.perf_counter() - started) / number)
+
+    return {
+        "min_s": min(per_call),
+        "median_s": statistics.median(per_call),
+        "mean_s": statistics.fmean(per_call),
+        "rounds": rounds,
+        "number": number,
+    }
+
+
+# ==========================================
+# 준비 (임시 작업 디렉터리)
+# ==========================================
+
+def _patch_paths(workdir: Path) -> None:
+    import belong.ml as ml
+
+    loaded = [name for name in sys.modules if name.startswith("belong.ml.")]
+    if loaded:
+        raise RuntimeError(
+            f"belong.ml 하위 모듈이 이미 로드돼 있습니다 ({loaded[0]} 등). "
+            "벤치마크는 새 프로세스에서 실행해 주세요."
+        )
+    ml.DATA_PATH = workdir / "Dataset_ML.csv"
+    ml.MODEL_PATH = workdir / "lonely_death_model.pkl"
+    ml.FAST_MODEL_PATH = workdir / "lonely_death_model.npz"
+    ml.MODEL_REGISTRY_DIR = workdir / "models"
+    ml.MODEL_REPORT_PATH = workdir / "lonely_death_model_report.json"
+    ml.FUTURE_PRED_PATH = workdir / "future_pred.csv"
+
+
+def prepare(workdir: Path, groups: int, years: int, seed: int) -> Dict[str, float]:
+    """합성 데이터 / 모델 / 미래 예측 CSV 를 만들고 단계별 소요 시간을 반환"""
+    _patch_paths(workdir)
+
+    from belong.ml import DATA_PATH, FINAL_FEATURES, TARGET_COL
+    from belong.ml import loader
+    from belong.ml.preprocess import build_feature_dataframe
+    from belong.ml.train_lonely_death import DEFAULT_PARAMS, _save, build_pipeline
+
+    from .synthetic import write_dataset
+
+    timings = {}
+    started = time.perf_counter()
+    write_dataset(DATA_PATH, n_groups=groups, n_years=years, seed=seed)
+    timings["dataset_s"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    df = build_feature_dataframe(DATA_PATH)
+    X = df[FINAL_FEATURES]
+    pipeline = build_pipeline(**{**DEFAULT_PARAMS, "n_estimators": BENCH_ESTIMATORS})
+    pipeline.fit(X, df[TARGET_COL])
+    _save(pipeline, X)
+    timings["train_s"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    loader.warmup()
+    loader.regenerate_future_store()
+    timings["load_and_forecast_s"] = time.perf_counter() - started
+    return timings
+
+
+def _make_app(workdir: Path):
+    import config
+    from belong import create_app, db
+    from belong.models import Answer, Question
+
+    config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{workdir / 'bench.db'}"
+    config.INSTRUMENTATION_ENABLED = False
+    app = create_app()
+    app.config.update(WTF_CSRF_ENABLED=False)
+
+    with app.app_context():
+        db.create_all()
+        base = datetime(2024, 1, 1)
+        db.session.execute(Question.__table__.insert(), [
+            {"subject": f"질문 {i}", "content": "내용", "create_date": base + timedelta(minutes=i)}
+            for i in range(N_QUESTIONS)
+        ])
+        db.session.execute(Answer.__table__.insert(), [
+            {"question_id": q, "content": "답변", "create_date": base + timedelta(minutes=q, seconds=k)}
+            for q in range(1, N_QUESTIONS + 1, 7) for k in range(3)
+        ])
+        db.session.commit()
+    return app
+
+
+# ==========================================
+# 항목
+# ==========================================
+
+def ml_cases() -> Dict[str, Callable[[], Any]]:
+    from belong.ml import DATA_PATH
+    from belong.ml import loader
+    from belong.ml.preprocess import build_feature_dataframe
+
+    pairs = sorted(loader.prediction_table().keys())
+    regions = loader.future_store().regions()
+    next_pair = itertools.cycle(pairs).__next__
+    next_gu = itertools.cycle(regions).__next__
+
+    return {
+        "ml.build_feature_dataframe": lambda: build_feature_dataframe(DATA_PATH),
+        "ml.predict_for": lambda: loader.predict_for(*next_pair()),
+        "ml.predict_many[all]": lambda: loader.predict_many(pairs),
+        "ml.get_future_curve_for_gu": lambda: loader.get_future_curve_for_gu(next_gu()),
+    }
+
+
+def web_cases(workdir: Path) -> Dict[str, Callable[[], Any]]:
+    from belong.ml import loader
+    from belong.models import Question
+    from belong.pagination import Cursor
+
+    app = _make_app(workdir)
+    client = app.test_client()
+
+    pairs = sorted(loader.prediction_table().keys())
+    regions = loader.future_store().regions()
+    next_pair = itertools.cycle(pairs).__next__
+    next_gu = itertools.cycle(regions).__next__
+
+    with app.app_context():
+        deep = Question.query.order_by(Question.create_date.asc(), Question.id.asc()).offset(20).first()
+        deep_cursor = Cursor(deep.create_date, deep.id, N_QUESTIONS - 21).encode()
+
+    def get(url):
+        response = client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {url} → {response.status_code}")
+
+    def post_predict():
+        gu, year = next_pair()
+        response = client.post("/predict/", data={"gu": gu, "year": str(year)})
+        if response.status_code != 200:
+            raise RuntimeError(f"POST /predict/ → {response.status_code}")
+
+    return {
+        "web.GET /predict/": lambda: get("/predict/"),
+        "web.POST /predict/": post_predict,
+        "web.GET /predict/future": lambda: get(f"/predict/future?gu={next_gu()}"),
+        "web.GET /question/list/": lambda: get("/question/list/"),
+        "web.GET /question/list/ (deep)": lambda: get(f"/question/list/?after={deep_cursor}"),
+    }
+
+
+# ==========================================
+# 실행 / 비교
+# ==========================================
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10,
+            cwd=Path(__file__).resolve().parent,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run(groups: int = DEFAULT_GROUPS, years: int = DEFAULT_YEARS, seed: int = 0,
+        rounds: int = DEFAULT_ROUNDS, min_time: float = DEFAULT_MIN_TIME,
+        only: Optional[List[str]] = None) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="belong-bench-") as tmp:
+        workdir = Path(tmp)
+        setup = prepare(workdir, groups, years, seed)
+
+        cases = ml_cases()
+        if not only or any(not p.startswith("ml.") for p in only):
+            cases.update(web_cases(workdir))
+        if only:
+            cases = {name: fn for name, fn in cases.items() if any(name.startswith(p) for p in only)}
+
+        results = {}
+        for name, fn in cases.items():
+            results[name] = measure(fn, rounds=rounds, min_time=min_time)
+            print(f"{name:34s} median {results[name]['median_s'] * 1000:10.4f} ms "
+                  f"(min {results[name]['min_s'] * 1000:.4f}, x{results[name]['number']})",
+                  file=sys.stderr)
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "groups": groups,
+            "years": years,
+            "seed": seed,
+            "rounds": rounds,
+            "setup": setup,
+        },
+        "results": results,
+    }
+
+
+def compare(base: Dict[str, Any], new: Dict[str, Any],
+            threshold: float = DEFAULT_THRESHOLD, stat: str = DEFAULT_STAT) -> List[str]:
+    """stat(min / median / mean) 기준 비교표를 출력하고 회귀한 항목 이름 목록을 반환"""
+    key = f"{stat}_s"
+    for field in ("groups", "years", "seed"):
+        if base["meta"].get(field) != new["meta"].get(field):
+            print(f"주의: {field} 가 다릅니다 ({base['meta'].get(field)} vs {new['meta'].get(field)})")
+
+    regressions = []
+    print(f"{'benchmark':34s} {'base ms':>10s} {'new ms':>10s} {'change':>8s}  ({stat})")
+    for name in sorted(set(base["results"]) | set(new["results"])):
+        old, cur = base["results"].get(name), new["results"].get(name)
+        if old is None or cur is None:
+            print(f"{name:34s} {'-' if old is None else 'only in base':>30s}")
+            continue
+        ratio = cur[key] / old[key] if old[key] else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        print(f"{name:34s} {old[key] * 1000:10.4f} {cur[key] * 1000:10.4f} "
+              f"{(ratio - 1) * 100:+7.1f}%{flag}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="belong ML / 웹 벤치마크")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="벤치마크 실행 후 JSON 출력")
+    p_run.add_argument("--groups", type=int, default=DEFAULT_GROUPS, help="합성 데이터 구 수")
+    p_run.add_argument("--years", type=int, default=DEFAULT_YEARS, help="합성 데이터 연도 수")
+    p_run.add_argument("--seed", type=int, default=0)
+    p_run.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    p_run.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME, help="라운드당 최소 시간(초)")
+    p_run.add_argument("--only", action="append", help="이 접두어로 시작하는 항목만 (여러 번 가능)")
+    p_run.add_argument("--out", help="결과 JSON 경로 (기본: 표준 출력)")
+
+    p_cmp = sub.add_parser("compare", help="두 결과 JSON 비교 (회귀 시 종료 코드 1)")
+    p_cmp.add_argument("base")
+    p_cmp.add_argument("new")
+    p_cmp.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                       help="이 비율보다 느려지면 회귀 (기본 0.15 = 15%%)")
+    p_cmp.add_argument("--stat", choices=("min", "median", "mean"), default=DEFAULT_STAT,
+                       help="비교 기준 통계 (기본 min)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        result = run(args.groups, args.years, args.seed, args.rounds, args.min_time, args.only)
+        text = json.dumps(result, ensure_ascii=False, indent=2)
+        if args.out:
+            Path(args.out).write_text(text + "\n", encoding="utf-8")
+        else:
+            print(text)
+        return 0
+
+    base = json.loads(Path(args.base).read_text(encoding="utf-8"))
+    new = json.loads(Path(args.new).read_text(encoding="utf-8"))
+    regressions = compare(base, new, args.threshold, args.stat)
+    if regressions:
+        print(f"{len(regressions)}개 항목이 {args.threshold:.0%} 넘게 느려졌습니다: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+benchmarks.synthetic
+
+- 벤치마크용 가짜 Dataset_ML 패널 생성기
+- 구 수 / 연도 수를 바꿔가며 원본 CSV 와 같은 컬럼 구성의 DataFrame 을 만든다.
+  (구 이름은 n_groups <= 25 이면 REGION_FEATURES, 그보다 많으면 "구0001" 형식)
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from belong.ml import REGION_FEATURES, TARGET_COL
+
+NUMERIC_COLUMNS = {
+    "노령화지수": (80, 250),
+    "1인가구_비율": (20, 50),
+    "65세 이상": (3e4, 9e4),
+    "소비자물가": (90, 115),
+    "저소득노인_65~79비율": (1, 10),
+    "저소득노인_80이상비율": (1, 10),
+    "기초생활수급자비율": (1, 8),
+    "총인구": (2e5, 6e5),
+}
+
+
+def region_names(n_groups: int):
+    if n_groups <= len(REGION_FEATURES):
+        return list(REGION_FEATURES[:n_groups])
+    return [f"구{i:05d}" for i in range(n_groups)]
+
+
+def make_raw_panel(
+    n_groups: int = 25,
+    n_years: int = 15,
+    first_year: int = 2010,
+    one_hot: bool = True,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    (구, 연도) 패널 DataFrame. 행 순서는 섞여 있다 (실제 CSV 처럼 정렬 가정 없이).
+    one_hot=True 이면 REGION_FEATURES 원-핫 컬럼도 만든다 (25개 구 기준).
+    """
+    rng = np.random.default_rng(seed)
+    regions = region_names(n_groups)
+    n = n_groups * n_years
+
+    df = pd.DataFrame({
+        "구": np.repeat(regions, n_years),
+        "연도": np.tile(np.arange(first_year, first_year + n_years), n_groups),
+        TARGET_COL: rng.integers(5, 40, size=n).astype(float),
+    })
+    for name, (lo, hi) in NUMERIC_COLUMNS.items():
+        df[name] = rng.uniform(lo, hi, size=n)
+
+    if one_hot:
+        for gu in REGION_FEATURES:
+            df[gu] = (df["구"] == gu).astype(int)
+
+    return df.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+def write_dataset(path, n_groups: int = 25, n_years: int = 15, seed: int = 0) -> None:
+    """Dataset_ML.csv 형식으로 저장"""
+    make_raw_panel(n_groups, n_years, seed=seed).to_csv(path, index=False)
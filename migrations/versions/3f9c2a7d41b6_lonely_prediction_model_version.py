@@ -0,0 +1,31 @@
+"""lonely_prediction.model_version
+
+Revision ID: 3f9c2a7d41b6
+Revises: d8593d1f43da
+Create Date: 2026-10-18 01:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9c2a7d41b6'
+down_revision = 'd8593d1f43da'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # lonely_prediction 은 db.create_all() 로 만들어진 환경이 있어서 있을 때만 변경
+    if not sa.inspect(op.get_bind()).has_table('lonely_prediction'):
+        return
+    with op.batch_alter_table('lonely_prediction', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('model_version', sa.String(length=40), nullable=True))
+
+
+def downgrade():
+    if not sa.inspect(op.get_bind()).has_table('lonely_prediction'):
+        return
+    with op.batch_alter_table('lonely_prediction', schema=None) as batch_op:
+        batch_op.drop_column('model_version')
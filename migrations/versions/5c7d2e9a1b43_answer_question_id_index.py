@@ -0,0 +1,26 @@
+"""answer (question_id, create_date) index
+
+Revision ID: 5c7d2e9a1b43
+Revises: 8a1e5c3b9f20
+Create Date: 2026-10-18 03:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c7d2e9a1b43'
+down_revision = '8a1e5c3b9f20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('answer', schema=None) as batch_op:
+        batch_op.create_index('ix_answer_question_id_create_date', ['question_id', 'create_date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('answer', schema=None) as batch_op:
+        batch_op.drop_index('ix_answer_question_id_create_date')